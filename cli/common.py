@@ -6,7 +6,7 @@ import logging
 import socket
 import threading
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, Optional
 
@@ -48,7 +48,7 @@ def jsonl_logger(name: str):
     path = LOG_DIR / f"{name}.jsonl"
     with path.open("a", encoding="utf-8") as handle:
         def _write(record: Dict[str, Any]) -> None:
-            payload = {"timestamp": datetime.utcnow().isoformat() + "Z", **record}
+            payload = {"timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"), **record}
             handle.write(json.dumps(payload) + "\n")
             handle.flush()
 
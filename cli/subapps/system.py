@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -80,11 +80,14 @@ def vpn_weather(
         nonlocal last_hourly_fetch
         while not stop_event.is_set():
             try:
+                hourly_due = time.time() - last_hourly_fetch >= 900
+                if hourly_due:
+                    start = datetime.now(timezone.utc)
+                    horizon = start + timedelta(hours=48)
+                    router.prefetch(start, horizon, 2)
                 now_df = router.get_nowcast(2)
                 _persist_weather(now_df, Path("data/weather/nowcast.csv"))
-                if time.time() - last_hourly_fetch >= 900:
-                    start = datetime.utcnow()
-                    horizon = start + timedelta(hours=48)
+                if hourly_due:
                     hourly_df = router.get_hourly(start, horizon)
                     _persist_weather(hourly_df, hourly_target)
                     last_hourly_fetch = time.time()
@@ -140,11 +143,14 @@ def vpn_weather_train(
             except Exception as exc:  # noqa: BLE001
                 console().print(f"[red]Polling failed:[/] {exc}")
             try:
+                hourly_due = time.time() - last_hourly_fetch >= 900
+                if hourly_due:
+                    start_hour = datetime.now(timezone.utc)
+                    horizon = start_hour + timedelta(hours=48)
+                    router.prefetch(start_hour, horizon, 2)
                 now_df = router.get_nowcast(2)
                 _persist_weather(now_df, Path("data/weather/nowcast.csv"))
-                if time.time() - last_hourly_fetch >= 900:
-                    start_hour = datetime.utcnow()
-                    horizon = start_hour + timedelta(hours=48)
+                if hourly_due:
                     hourly_df = router.get_hourly(start_hour, horizon)
                     _persist_weather(hourly_df, hourly_target)
                     last_hourly_fetch = time.time()
@@ -183,7 +189,7 @@ def full(
                 last_nowcast = now
             if now - last_hourly >= hourly_period:
                 try:
-                    start = datetime.utcnow()
+                    start = datetime.now(timezone.utc)
                     router.get_hourly(start, start + timedelta(hours=48))
                 except Exception as exc:  # noqa: BLE001
                     console().print(f"[red]Hourly error:[/] {exc}")
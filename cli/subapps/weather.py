@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -43,7 +43,7 @@ def hourly(
     config: Optional[Path] = typer.Option(None),
 ) -> None:
     router = _build_router(config)
-    now = datetime.utcnow()
+    now = datetime.now(timezone.utc)
     horizon = now + timedelta(hours=hours)
     frame = router.get_hourly(now, horizon)
     ensure_dir(out)
@@ -64,13 +64,13 @@ def export_anre(
     df = pd.read_parquet(source)
     df = df.sort_index()
     horizon_hours = 24 if type == "intraday" else 48
-    start = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
     end = start + timedelta(hours=horizon_hours)
     sliced = df.loc[(df.index >= start) & (df.index < end)]
     if sliced.empty:
         raise RuntimeError("No data available for requested horizon")
 
-    export_dir = out / datetime.utcnow().date().isoformat()
+    export_dir = out / datetime.now(timezone.utc).date().isoformat()
     export_dir.mkdir(parents=True, exist_ok=True)
     export_path = export_dir / f"weather_{type}.csv"
     sliced.reset_index().rename(columns={"timestamp": "datetime"}).to_csv(export_path, index=False)
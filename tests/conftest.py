@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import logging
 import os
 from pathlib import Path
-from typing import Dict, Generator, Iterable, Tuple
+from typing import Any, Dict, Generator, Iterable, Tuple
 
 import pandas as pd
 import pytest
@@ -16,6 +17,8 @@ from tests.helpers import (
     FakeModbusClient,
     FakeOpenVPNManager,
     FakeProvider,
+    FakeRouter,
+    MemoryCache,
     build_fake_umg_frame,
     build_fake_weather_frame,
     ensure_directory,
@@ -23,10 +26,20 @@ from tests.helpers import (
     write_parquet,
 )
 
+try:
+    from app import janitza_client, vpn_connection
+except ImportError:  # pragma: no cover - optional runtime dependencies (psutil, pymodbus)
+    janitza_client = None  # type: ignore[assignment]
+    vpn_connection = None  # type: ignore[assignment]
+
 LOGS_ROOT = Path(__file__).resolve().parents[1] / "logs" / "tests"
 SESSION_LOG = LOGS_ROOT / "pytest.session.log"
 _MODULE_HANDLERS: Dict[str, logging.Handler] = {}
 
+# Shared immutable indexes; DatetimeIndex objects are safe to reuse across tests.
+IDX_UTC_1MIN_5 = pd.date_range("2024-01-01T00:00:00Z", periods=5, freq="min")
+IDX_UTC_1H_24 = pd.date_range("2024-01-01T00:00:00Z", periods=24, freq="1h")
+
 
 def _initialise_logging() -> None:
     LOGS_ROOT.mkdir(parents=True, exist_ok=True)
@@ -91,6 +104,12 @@ def logs_dir() -> Path:
     return LOGS_ROOT
 
 
+@pytest.fixture
+def data_quality_config() -> Dict[str, Any]:
+    """Data-quality settings for the synthetic CSVs: UTC, no range checks."""
+    return {"timezone": "UTC", "drift_sec_max": 3, "ranges": {}, "forward_fill_max": 2}
+
+
 @pytest.fixture
 def fake_umg_csv(tmp_path: Path) -> Path:
     frame = build_fake_umg_frame()
@@ -107,7 +126,8 @@ def fake_weather_parquet(tmp_path: Path) -> Path:
 
 @pytest.fixture
 def mock_vpn(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
-    from app import vpn_connection
+    if vpn_connection is None:  # pragma: no cover - optional dependency missing
+        pytest.skip("app.vpn_connection dependencies are not installed")
 
     assets_dir = tmp_path / "assets"
     profile_path = tmp_path / "profile.ovpn"
@@ -152,7 +172,8 @@ def mock_vpn(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
 
 @pytest.fixture
 def mock_modbus(monkeypatch: pytest.MonkeyPatch) -> None:
-    from app import janitza_client
+    if janitza_client is None:  # pragma: no cover - optional dependency missing
+        pytest.skip("app.janitza_client dependencies are not installed")
 
     monkeypatch.setattr(janitza_client, "ModbusTcpClient", FakeModbusClient)
     monkeypatch.setattr(janitza_client.JanitzaUMG, "tcp_ping", staticmethod(lambda *_, **__: 12.5))
@@ -184,18 +205,34 @@ def mock_http(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
         }
     }
 
+    response = FakeHttpResponse(payload)
+
     def _fake_get(*args, **kwargs):
-        return FakeHttpResponse(payload)
+        return response
 
     class _Session:
         def get(self, *args, **kwargs):
-            return _fake_get(*args, **kwargs)
+            return response
+
+        def mount(self, prefix, adapter) -> None:  # pragma: no cover - trivial
+            return None
 
     monkeypatch.setattr(requests, "get", _fake_get)
     monkeypatch.setattr(requests, "Session", lambda: _Session())
     return payload
 
 
+@pytest.fixture(scope="session")
+def fake_router_prototype() -> FakeRouter:
+    return FakeRouter()
+
+
+@pytest.fixture
+def fake_router(fake_router_prototype: FakeRouter) -> FakeRouter:
+    """Per-test shallow copy of the session router so call counters start at zero."""
+    return copy.copy(fake_router_prototype)
+
+
 @pytest.fixture
 def mock_uvicorn(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Tuple[str, int, bool]]:
     calls: Dict[str, Tuple[str, int, bool]] = {}
@@ -203,24 +240,24 @@ def mock_uvicorn(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Tuple[str, int, b
     def _fake_start(host: str, port: int, *, open_browser: bool = True) -> None:
         calls["start"] = (host, port, open_browser)
 
-    monkeypatch.setattr("ui.server.start_ui", _fake_start)
+    from ui import server as ui_server
+
+    monkeypatch.setattr(ui_server, "start_ui", _fake_start)
     return calls
 
 
 @pytest.fixture(scope="session")
-def weather_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
-    return tmp_path_factory.mktemp("weather-cache") / "cache.sqlite"
+def mem_cache() -> MemoryCache:
+    return MemoryCache()
 
 
 @pytest.fixture(autouse=True)
-def patch_weather_cache(monkeypatch: pytest.MonkeyPatch, weather_cache_dir: Path) -> None:
+def patch_weather_cache(monkeypatch: pytest.MonkeyPatch, mem_cache: MemoryCache) -> None:
+    """Route ``WeatherCache.default()`` to the shared in-memory cache, emptied per test."""
     from weather import cache as weather_cache
 
-    def _factory(path: Path | None = None) -> weather_cache.WeatherCache:
-        target = path or weather_cache_dir
-        return weather_cache.WeatherCache(path=target)
-
-    monkeypatch.setattr(weather_cache.WeatherCache, "default", classmethod(lambda cls: _factory()))
+    mem_cache.clear()
+    monkeypatch.setattr(weather_cache.WeatherCache, "default", classmethod(lambda cls: mem_cache))
 
 
 @pytest.fixture(autouse=True)
@@ -230,5 +267,7 @@ def clear_llm_env(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 __all__ = [
+    "IDX_UTC_1H_24",
+    "IDX_UTC_1MIN_5",
     "get_test_logger",
 ]
@@ -7,7 +7,9 @@ from .mocks import (
     FakeModbusClient,
     FakeOpenVPNManager,
     FakeProvider,
+    FakeRouter,
     FakeVpnConnection,
+    MemoryCache,
 )
 
 __all__ = [
@@ -20,5 +22,7 @@ __all__ = [
     "FakeModbusClient",
     "FakeOpenVPNManager",
     "FakeProvider",
+    "FakeRouter",
     "FakeVpnConnection",
+    "MemoryCache",
 ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable
@@ -54,15 +55,16 @@ def build_fake_weather_frame(
     """Return a deterministic hourly weather dataframe."""
     index = pd.date_range(start=start, periods=periods, freq=freq, tz="UTC")
     hours = np.arange(periods)
+    daily_sin = np.sin(hours * (2 * np.pi / 24))
     frame = pd.DataFrame(
         {
-            "temp_C": 5 + 10 * np.sin(hours / 24 * 2 * np.pi),
-            "wind_ms": 3 + np.cos(hours / 12 * 2 * np.pi),
+            "temp_C": 5 + 10 * daily_sin,
+            "wind_ms": 3 + np.cos(hours * (2 * np.pi / 12)),
             "wind_deg": (hours * 15) % 360,
             "clouds_pct": np.clip(50 + 30 * np.sin(hours / 6), 0, 100),
             "humidity": np.clip(60 + 10 * np.cos(hours / 5), 0, 100),
-            "uvi": np.clip(2 + np.sin(hours / 24 * 2 * np.pi), 0, None),
-            "ghi_Wm2": np.clip(100 + 50 * np.sin(hours / 24 * 2 * np.pi), 0, None),
+            "uvi": np.clip(2 + daily_sin, 0, None),
+            "ghi_Wm2": np.clip(100 + 50 * daily_sin, 0, None),
         },
         index=index,
     )
@@ -70,8 +72,11 @@ def build_fake_weather_frame(
 
 
 def write_csv(frame: pd.DataFrame, path: Path) -> Path:
+    """Serialise ``frame`` in memory and write it with a single file operation."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    frame.to_csv(path, index=False)
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, lineterminator="\n")
+    path.write_text(buffer.getvalue(), encoding="utf-8")
     return path
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import time
 from dataclasses import dataclass, field
 from types import SimpleNamespace
@@ -16,7 +17,9 @@ __all__ = [
     "FakeModbusClient",
     "FakeOpenVPNManager",
     "FakeProvider",
+    "FakeRouter",
     "FakeVpnConnection",
+    "MemoryCache",
 ]
 
 
@@ -28,9 +31,16 @@ class FakeHttpResponse:
         self.status_code = status_code
         self.text = ""
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
     def json(self) -> Dict[str, Any]:
         return self._payload
 
+    def raise_for_status(self) -> None:  # pragma: no cover - trivial
+        return None
+
 
 class FakeModbusClient:
     """In-memory Modbus client returning deterministic float values."""
@@ -85,20 +95,38 @@ class FakeOpenVPNManager:
         return self.pid if self.profile_running else None
 
 
-class _MemoryCache:
+def _as_utc(value: Any) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+class MemoryCache:
+    """Dict-backed stand-in for :class:`weather.cache.WeatherCache`."""
+
     def __init__(self) -> None:
         self._storage: Dict[tuple[str, str, str], tuple[float, pd.DataFrame]] = {}
 
     def get(self, provider: str, scope: str, cache_key: str) -> Optional[pd.DataFrame]:
+        hit = self.lookup(provider, scope, cache_key)
+        return hit[0] if hit is not None else None
+
+    def lookup(
+        self,
+        provider: str,
+        scope: str,
+        cache_key: str,
+        max_stale: float = 0.0,
+    ) -> Optional[tuple[pd.DataFrame, bool]]:
         key = (provider, scope, cache_key)
         payload = self._storage.get(key)
         if not payload:
             return None
         expires_at, frame = payload
-        if expires_at < time.time():
+        now = time.time()
+        if expires_at + max_stale < now:
             self._storage.pop(key, None)
             return None
-        return frame.copy()
+        return frame.copy(), expires_at < now
 
     def set(
         self,
@@ -110,6 +138,9 @@ class _MemoryCache:
     ) -> None:
         self._storage[(provider, scope, cache_key)] = (time.time() + ttl_seconds, frame.copy())
 
+    def clear(self) -> None:
+        self._storage.clear()
+
 
 @dataclass
 class FakeProvider(Provider):
@@ -123,20 +154,11 @@ class FakeProvider(Provider):
     nowcast_builder: Optional[Callable[[int], pd.DataFrame]] = None
 
     def __post_init__(self) -> None:  # pragma: no cover - dataclass init
-        super().__init__(self.name, priority=self.priority, cache=_MemoryCache(), ttl=300)
+        super().__init__(self.name, priority=self.priority, cache=MemoryCache(), ttl=300)
 
     def get_hourly(self, start: Any, end: Any) -> ForecastFrame:
-        start_ts = pd.Timestamp(start)
-        if start_ts.tzinfo is None:
-            start_ts = start_ts.tz_localize("UTC")
-        else:
-            start_ts = start_ts.tz_convert("UTC")
-
-        end_ts = pd.Timestamp(end)
-        if end_ts.tzinfo is None:
-            end_ts = end_ts.tz_localize("UTC")
-        else:
-            end_ts = end_ts.tz_convert("UTC")
+        start_ts = _as_utc(start)
+        end_ts = _as_utc(end)
 
         def _builder() -> pd.DataFrame:
             frame = self.hourly_builder(start_ts, end_ts)
@@ -151,7 +173,8 @@ class FakeProvider(Provider):
         )
         return ForecastFrame(frame, {"source": self.name})
 
-    def supports_nowcast(self) -> bool:
+    @property
+    def supports_nowcast(self) -> bool:  # type: ignore[override]
         return self.nowcast_builder is not None
 
     def get_nowcast(self, next_hours: int = 2) -> ForecastFrame:
@@ -171,6 +194,24 @@ class FakeProvider(Provider):
         return ForecastFrame(frame, {"source": self.name})
 
 
+class FakeRouter:
+    """Weather router stand-in returning small synthetic frames."""
+
+    def __init__(self) -> None:
+        self.nowcast_calls = 0
+        self.hourly_calls = 0
+
+    def get_nowcast(self, hours: int) -> pd.DataFrame:
+        self.nowcast_calls += 1
+        idx = pd.date_range("2024-01-01T00:00:00Z", periods=hours * 4, freq="15min", tz="UTC")
+        return pd.DataFrame({"temp_C": range(len(idx))}, index=idx)
+
+    def get_hourly(self, start: Any, end: Any) -> pd.DataFrame:
+        self.hourly_calls += 1
+        idx = pd.date_range(start, end, freq="1h", tz="UTC")
+        return pd.DataFrame({"temp_C": range(len(idx))}, index=idx)
+
+
 class FakeVpnConnection:
     """Simplified VPN connection used for CLI simulations."""
 
@@ -6,46 +6,61 @@ from types import SimpleNamespace
 
 import pytest
 
+from ai import orchestrator as orchestrator_module
 from tests.conftest import get_test_logger
 
 logger = get_test_logger(__name__)
 logger.info("Starting tests for AI orchestrator module")
 
+_FAKE_SELECT_RESULT = {"choice": "physics", "confidence": 0.95, "source": "rules"}
+_FAKE_DRIFT_SUMMARY = {"drift_score": 0.12, "top_features": ["temp_C", "ghi_Wm2"]}
+_FAKE_EXPLANATION = "## Forecast rationale\n- Stable outlook"
 
-def test_ai_orchestrator_interfaces(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Ensure orchestrator delegates to mocked strategy components."""
-    from ai import orchestrator as orchestrator_module
 
-    logger.info("Running AI orchestrator delegation test")
+class DummySelector:
+    """Selector stub returning a fixed rules-based decision."""
+
+    def __init__(self, config):
+        self.config = config
+        self.provider_registry = SimpleNamespace(first_available=lambda: None)
+
+    def select_model(self, context):
+        return _FAKE_SELECT_RESULT
+
 
-    class DummySelector:
-        def __init__(self, config):
-            self.config = config
-            self.provider_registry = SimpleNamespace(first_available=lambda: None)
+class DummyDriftAnalyzer:
+    """Drift analyzer stub with a constant summary."""
 
-        def select_model(self, context):
-            return {"choice": "physics", "confidence": 0.95, "source": "rules"}
+    def __init__(self, config):
+        self.config = config
 
-    class DummyDriftAnalyzer:
-        def __init__(self, config):
-            self.config = config
+    def drift_summary(self, ref_stats, cur_stats):
+        return _FAKE_DRIFT_SUMMARY
 
-        def drift_summary(self, ref_stats, cur_stats):
-            return {"drift_score": 0.12, "top_features": ["temp_C", "ghi_Wm2"]}
 
-    class DummyExplainer:
-        def __init__(self, config, registry):
-            self.config = config
-            self.registry = registry
+class DummyExplainer:
+    """Explainer stub emitting a canned markdown rationale."""
 
-        def explain_forecast(self, context):
-            return "## Forecast rationale\n- Stable outlook"
+    def __init__(self, config, registry):
+        self.config = config
+        self.registry = registry
 
+    def explain_forecast(self, context):
+        return _FAKE_EXPLANATION
+
+
+@pytest.fixture
+def orchestrator(monkeypatch: pytest.MonkeyPatch):
+    """AIOrchestrator wired to the dummy strategy classes (one swap per class)."""
     monkeypatch.setattr(orchestrator_module, "ModelSelector", DummySelector)
     monkeypatch.setattr(orchestrator_module, "DriftAnalyzer", DummyDriftAnalyzer)
     monkeypatch.setattr(orchestrator_module, "ForecastExplainer", DummyExplainer)
+    return orchestrator_module.AIOrchestrator(config={})
+
 
-    orchestrator = orchestrator_module.AIOrchestrator(config={})
+def test_ai_orchestrator_interfaces(orchestrator) -> None:
+    """Ensure orchestrator delegates to mocked strategy components."""
+    logger.info("Running AI orchestrator delegation test")
 
     decision = orchestrator.select_model({"metrics": {"mape_intraday": 4.2}})
     assert decision["choice"] == "physics"
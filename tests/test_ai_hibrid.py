@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Dict, Iterator, NamedTuple
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from tests.conftest import get_test_logger
+from tests.conftest import IDX_UTC_1H_24, get_test_logger
+from tests.helpers import build_fake_umg_frame, build_fake_weather_frame, write_csv, write_parquet
 
 logger = get_test_logger(__name__)
 logger.info("Starting tests for AI Hibrid module")
 
+CONFIG_PAYLOAD = {"site": {"timezone": "UTC"}}
+
 
 class DummyModel:
     """Serializable placeholder model used in tests."""
@@ -21,72 +25,109 @@ class DummyModel:
         self.bias = bias
 
 
-def test_train_and_predict_pipeline(
-    tmp_path: Path,
-    fake_umg_csv: Path,
-    fake_weather_parquet: Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """End-to-end smoke test for train/predict pipelines with lightweight mocks."""
-    from ai_hibrid.pipeline import predict as predict_module
-    from ai_hibrid.pipeline import train as train_module
+class TrainedPipeline(NamedTuple):
+    """Artifacts produced once by ``train_pipeline`` and shared across tests."""
+
+    metrics: Dict[str, Dict[str, float]]
+    artifact_root: Path
+    config_path: Path
+    weather_path: Path
+    features: pd.DataFrame
 
-    logger.info("Running hybrid pipeline train/predict test")
 
-    timestamps = pd.date_range("2024-01-01T00:00:00Z", periods=24, freq="1h", tz="UTC")
+def _build_dataset() -> pd.DataFrame:
+    timestamps = IDX_UTC_1H_24
     base = np.arange(len(timestamps), dtype=float)
     physics = pd.Series(100 + base, index=timestamps, name="power_physics_W")
     feature = pd.Series(base, index=timestamps, name="feature_a")
     target = physics + 5
+    return pd.concat([feature, physics, target.rename("target_power_W")], axis=1)
 
-    dataset = pd.concat([feature, physics, target.rename("target_power_W")], axis=1)
-    features_only = dataset.drop(columns=["target_power_W"])
 
-    config_payload = {"site": {"timezone": "UTC"}}
-    monkeypatch.setattr(train_module, "load_config", lambda path: config_payload)
-    monkeypatch.setattr(predict_module, "load_config", lambda path: config_payload)
-    monkeypatch.setattr(train_module, "build_training_dataset", lambda *_: (dataset.copy(), {}))
-    monkeypatch.setattr(
-        predict_module,
-        "build_feature_matrix",
-        lambda weather, index, cfg, include_lags=True: (features_only.copy(), {}),
+def fake_train_xgb(features: pd.DataFrame, target: pd.Series, validation_fraction: float = 0.2):
+    model = DummyModel(bias=float(target.mean()))
+    metrics = {"mape": 0.1, "rmse": 0.5}
+    return model, metrics
+
+
+def fake_predict_xgb(model: DummyModel, features: pd.DataFrame):
+    return [model.bias + idx * 0.01 for idx in range(len(features))]
+
+
+def fake_blend(physics, ml, alpha):
+    return physics * (1 - alpha) + ml * alpha
+
+
+@pytest.fixture(scope="module")
+def trained_pipeline(tmp_path_factory: pytest.TempPathFactory) -> Iterator[TrainedPipeline]:
+    """Train once per module with lightweight mocks and expose the artifacts."""
+    from ai_hibrid.pipeline import train as train_module
+
+    root = tmp_path_factory.mktemp("pipeline")
+    umg_csv = write_csv(build_fake_umg_frame(), root / "umg" / "measurements_20240101.csv")
+    weather_path = write_parquet(build_fake_weather_frame(), root / "weather" / "weather_hourly.parquet")
+    config_path = root / "config.yaml"
+    artifact_root = root / "artifacts"
+
+    dataset = _build_dataset()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(train_module, "load_config", lambda path: CONFIG_PAYLOAD)
+        mp.setattr(train_module, "build_training_dataset", lambda *_: (dataset.copy(), {}))
+        mp.setattr(train_module, "train_xgb", fake_train_xgb)
+        mp.setattr(train_module, "predict_xgb", fake_predict_xgb)
+        mp.setattr(train_module, "tune_alpha", lambda *_, **__: (0.4, 1.0))
+        mp.setattr(train_module, "blend_predictions", fake_blend)
+        metrics = train_module.train_pipeline(
+            str(umg_csv),
+            str(weather_path),
+            str(config_path),
+            artifact_root=artifact_root,
+        )
+
+    yield TrainedPipeline(
+        metrics=metrics,
+        artifact_root=artifact_root,
+        config_path=config_path,
+        weather_path=weather_path,
+        features=dataset.drop(columns=["target_power_W"]),
     )
 
-    def fake_train_xgb(features: pd.DataFrame, target: pd.Series, validation_fraction: float = 0.2):
-        model = DummyModel(bias=float(target.mean()))
-        metrics = {"mape": 0.1, "rmse": 0.5}
-        return model, metrics
 
-    def fake_predict_xgb(model: DummyModel, features: pd.DataFrame):
-        return [model.bias + idx * 0.01 for idx in range(len(features))]
+def test_train_metrics(trained_pipeline: TrainedPipeline) -> None:
+    """Training reports metrics for every model family and persists artifacts."""
+    logger.info("Running hybrid pipeline train test")
 
-    monkeypatch.setattr(train_module, "train_xgb", fake_train_xgb)
-    monkeypatch.setattr(train_module, "predict_xgb", fake_predict_xgb)
-    monkeypatch.setattr(predict_module, "predict_xgb", fake_predict_xgb)
-    monkeypatch.setattr(train_module, "tune_alpha", lambda *_, **__: (0.4, 1.0))
-    monkeypatch.setattr(train_module, "blend_predictions", lambda physics, ml, alpha: physics * (1 - alpha) + ml * alpha)
+    assert set(trained_pipeline.metrics.keys()) >= {"physics", "ml", "blended"}
+    assert trained_pipeline.artifact_root.exists()
+
+
+def test_predict_pipeline(
+    trained_pipeline: TrainedPipeline,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Prediction reuses the shared training artifacts to emit a blended forecast."""
+    from ai_hibrid.pipeline import predict as predict_module
+
+    logger.info("Running hybrid pipeline predict test")
+
+    features_only = trained_pipeline.features
+    monkeypatch.setattr(predict_module, "load_config", lambda path: CONFIG_PAYLOAD)
     monkeypatch.setattr(
         predict_module,
-        "blend_predictions",
-        lambda physics, ml, alpha: physics * (1 - alpha) + ml * alpha,
-    )
-
-    artifact_root = tmp_path / "artifacts"
-    metrics = train_module.train_pipeline(
-        str(fake_umg_csv),
-        str(fake_weather_parquet),
-        str(tmp_path / "config.yaml"),
-        artifact_root=artifact_root,
+        "build_feature_matrix",
+        lambda weather, index, cfg, include_lags=True: (features_only.copy(), {}),
     )
-    assert set(metrics.keys()) >= {"physics", "ml", "blended"}
+    monkeypatch.setattr(predict_module, "predict_xgb", fake_predict_xgb)
+    monkeypatch.setattr(predict_module, "blend_predictions", fake_blend)
 
     forecast_path = tmp_path / "forecast.csv"
     predict_module.predict_pipeline(
-        str(fake_weather_parquet),
-        str(tmp_path / "config.yaml"),
+        str(trained_pipeline.weather_path),
+        str(trained_pipeline.config_path),
         horizon=6,
         out_path=forecast_path,
-        artifact_root=artifact_root,
+        artifact_root=trained_pipeline.artifact_root,
     )
     assert forecast_path.exists()
     forecast = pd.read_csv(forecast_path)
@@ -5,19 +5,22 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Dict, List
 
-import pandas as pd
 from typer.testing import CliRunner
 
 from tests.conftest import get_test_logger
-from tests.helpers import FakeVpnConnection
+from tests.helpers import FakeRouter, FakeVpnConnection
 
 logger = get_test_logger(__name__)
 logger.info("Starting tests for CLI module")
 
 
-def _prepare_runner() -> CliRunner:
-    runner = CliRunner()
-    return runner
+_RC_PAYLOAD = b'{"lang": "en"}'
+RUNNER = CliRunner(env={"NO_COLOR": "1"})
+
+
+def _seed_rc_file() -> None:
+    """Create the local ``.progonzarc`` so the CLI callback skips the language prompt."""
+    Path(".progonzarc").write_bytes(_RC_PAYLOAD)
 
 
 def test_cli_help(monkeypatch) -> None:
@@ -27,10 +30,9 @@ def test_cli_help(monkeypatch) -> None:
     logger.info("Running CLI --help test")
     monkeypatch.setattr(cli_app, "configure_logging", lambda *_: None)
 
-    runner = _prepare_runner()
-    with runner.isolated_filesystem():
-        Path(".progonzarc").write_text("lang=en", encoding="utf-8")
-        result = runner.invoke(cli_app.app, ["--help"])
+    with RUNNER.isolated_filesystem():
+        _seed_rc_file()
+        result = RUNNER.invoke(cli_app.app, ["--help"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "PROGONZA" in result.stdout
 
@@ -46,19 +48,18 @@ def test_vpn_commands(monkeypatch) -> None:
     monkeypatch.setattr(vpn_cli, "VPNConnection", FakeVpnConnection)
     monkeypatch.setattr(vpn_cli, "_check_tcp", lambda *_: True)
 
-    runner = _prepare_runner()
-    with runner.isolated_filesystem():
-        Path(".progonzarc").write_text("lang=en", encoding="utf-8")
-        status = runner.invoke(cli_app.app, ["vpn", "status"])
-        connect = runner.invoke(cli_app.app, ["vpn", "connect"])
-        disconnect = runner.invoke(cli_app.app, ["vpn", "disconnect"])
+    with RUNNER.isolated_filesystem():
+        _seed_rc_file()
+        status = RUNNER.invoke(cli_app.app, ["vpn", "status"], catch_exceptions=False)
+        connect = RUNNER.invoke(cli_app.app, ["vpn", "connect"], catch_exceptions=False)
+        disconnect = RUNNER.invoke(cli_app.app, ["vpn", "disconnect"], catch_exceptions=False)
 
     assert status.exit_code == 0 and "is_connected" in status.stdout
     assert connect.exit_code == 0 and "vpn_ip" in connect.stdout
     assert disconnect.exit_code == 0
 
 
-def test_system_vpn_weather(monkeypatch) -> None:
+def test_system_vpn_weather(monkeypatch, fake_router: FakeRouter) -> None:
     """system vpn-weather completes quickly with mocked scheduler and router."""
     from cli import app as cli_app
     from cli.subapps import system as system_cli
@@ -68,25 +69,7 @@ def test_system_vpn_weather(monkeypatch) -> None:
     call_log: List[float | None] = []
 
     monkeypatch.setattr(cli_app, "configure_logging", lambda *_: None)
-
-    class DummyRouter:
-        def __init__(self) -> None:
-            self.nowcast_calls = 0
-            self.hourly_calls = 0
-
-        def get_nowcast(self, hours: int):
-            self.nowcast_calls += 1
-            idx = pd.date_range("2024-01-01T00:00:00Z", periods=hours * 4, freq="15min", tz="UTC")
-            return pd.DataFrame({"temp_C": range(len(idx))}, index=idx)
-
-        def get_hourly(self, start, end):
-            self.hourly_calls += 1
-            idx = pd.date_range(start, end, freq="1h", tz="UTC")
-            return pd.DataFrame({"temp_C": range(len(idx))}, index=idx)
-
-    router = DummyRouter()
-
-    monkeypatch.setattr(system_cli, "_build_router", lambda *_: router)
+    monkeypatch.setattr(system_cli, "_build_router", lambda *_: fake_router)
     monkeypatch.setattr(system_cli, "_persist_weather", lambda *_, **__: None)
 
     current = {"value": 0.0}
@@ -111,12 +94,12 @@ def test_system_vpn_weather(monkeypatch) -> None:
 
     monkeypatch.setattr(system_cli, "poll_once", fake_poll_once)
 
-    runner = _prepare_runner()
-    with runner.isolated_filesystem():
-        Path(".progonzarc").write_text("lang=en", encoding="utf-8")
-        result = runner.invoke(
+    with RUNNER.isolated_filesystem():
+        _seed_rc_file()
+        result = RUNNER.invoke(
             cli_app.app,
             ["system", "vpn-weather", "--duration", "5"],
+            catch_exceptions=False,
         )
 
     assert result.exit_code == 0
@@ -132,10 +115,9 @@ def test_ui_start_command(monkeypatch, mock_uvicorn) -> None:
 
     monkeypatch.setattr(cli_app, "configure_logging", lambda *_: None)
 
-    runner = _prepare_runner()
-    with runner.isolated_filesystem():
-        Path(".progonzarc").write_text("lang=en", encoding="utf-8")
-        result = runner.invoke(cli_app.app, ["ui", "start", "--open"])
+    with RUNNER.isolated_filesystem():
+        _seed_rc_file()
+        result = RUNNER.invoke(cli_app.app, ["ui", "start", "--open"], catch_exceptions=False)
 
     assert result.exit_code == 0
     assert mock_uvicorn["start"] == ("127.0.0.1", 8090, True)
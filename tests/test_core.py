@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import builtins
 import json
+import time
 from pathlib import Path
+from types import SimpleNamespace
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from tests.conftest import get_test_logger
+from tests.conftest import IDX_UTC_1MIN_5, get_test_logger
+from tests.helpers import write_csv
 
 logger = get_test_logger(__name__)
 logger.info("Starting tests for core module")
@@ -20,74 +25,79 @@ def test_poll_loop_alignment(monkeypatch: pytest.MonkeyPatch) -> None:
 
     logger.info("Running poll loop alignment test")
 
-    current = {"wall": 100.0, "mono": 50.0}
+    current = [100.0, 50.0]  # [wall, monotonic]
     scheduled_calls: list[float | None] = []
 
     def fake_time() -> float:
-        return current["wall"]
+        return current[0]
 
     def fake_monotonic() -> float:
-        return current["mono"]
+        return current[1]
 
     def fake_sleep(seconds: float) -> None:
-        current["wall"] += seconds
-        current["mono"] += seconds
+        if seconds <= 0:
+            return
+        current[0] += seconds
+        current[1] += seconds
 
     def fake_poll_once(*, scheduled_wall_time: float | None = None, **_: object) -> dict[str, object]:
         scheduled_calls.append(scheduled_wall_time)
         payload = {
             "start_delay_s": 0.0,
-            "started_at": current["wall"],
+            "started_at": current[0],
             "scheduled_start": scheduled_wall_time,
         }
-        current["wall"] += 0.5
-        current["mono"] += 0.5
+        current[0] += 0.5
+        current[1] += 0.5
         return payload
 
-    monkeypatch.setattr(poll.time, "time", fake_time)
-    monkeypatch.setattr(poll.time, "monotonic", fake_monotonic)
-    monkeypatch.setattr(poll.time, "sleep", fake_sleep)
+    fake_clock = SimpleNamespace(
+        time=fake_time,
+        monotonic=fake_monotonic,
+        sleep=fake_sleep,
+        strftime=time.strftime,
+        localtime=time.localtime,
+    )
+    monkeypatch.setattr(poll, "time", fake_clock)
     monkeypatch.setattr(poll, "poll_once", fake_poll_once)
-    monkeypatch.setattr("builtins.print", lambda *_, **__: None)
+    monkeypatch.setattr(builtins, "print", lambda *_, **__: None)
 
     poll.poll_loop(interval_s=60, cycles=3, sync=True)
 
     assert scheduled_calls == [120.0, 180.0, 240.0]
 
 
-def test_data_quality_validation_and_repair(tmp_path: Path) -> None:
+def test_data_quality_validation_and_repair(tmp_path: Path, data_quality_config: dict) -> None:
     """Validate and repair a tiny CSV ensuring gaps are filled deterministically."""
     from core.data_quality import auto_repair_csv, validate_csv
 
     logger.info("Running data quality validation test")
 
-    index = pd.date_range("2024-01-01T00:00:00Z", periods=5, freq="1min")
+    index = IDX_UTC_1MIN_5
     frame = pd.DataFrame(
         {
             "timestamp": index.astype(str),
-            "power_active_total": [10, 11, 12, 13, 14],
-            "power_reactive_total": [1, 1, 1, 1, 1],
+            "power_active_total": np.arange(10, 10 + len(index)),
+            "power_reactive_total": np.ones(len(index), dtype=np.int64),
         }
     )
-    full_csv = tmp_path / "umg" / "full.csv"
-    full_csv.parent.mkdir(parents=True, exist_ok=True)
-    frame.to_csv(full_csv, index=False)
+    full_csv = write_csv(frame, tmp_path / "umg" / "full.csv")
 
-    cfg = {"timezone": "UTC", "drift_sec_max": 3, "ranges": {}, "forward_fill_max": 2}
+    cfg = data_quality_config
     result = validate_csv(full_csv, cfg)
     assert result["ok"] is True
     assert result["stats"]["missing_rate"] == pytest.approx(0.0, abs=1e-6)
 
-    gapped = frame.drop(2).reset_index(drop=True)
-    csv_path = tmp_path / "umg" / "sample.csv"
-    gapped.to_csv(csv_path, index=False)
+    gapped = pd.concat([frame.iloc[:2], frame.iloc[3:]], ignore_index=True)
+    csv_path = write_csv(gapped, tmp_path / "umg" / "sample.csv")
 
     repair_out = tmp_path / "umg" / "repaired.csv"
     repaired = auto_repair_csv(csv_path, repair_out, cfg)
     generated = repaired["repair"]["generated_rows"]
     assert generated >= 1
-    repaired_frame = pd.read_csv(repair_out)
-    assert len(repaired_frame) >= len(frame)
+    with repair_out.open("rb") as handle:
+        repaired_rows = sum(1 for _ in handle) - 1  # minus header
+    assert repaired_rows >= len(frame)
 
 
 def test_vpn_connection_context(mock_vpn: Path) -> None:
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator
 
 import pandas as pd
+import pytest
 from fastapi.testclient import TestClient
 
 from tests.conftest import get_test_logger
@@ -14,6 +16,15 @@ logger = get_test_logger(__name__)
 logger.info("Starting tests for UI module")
 
 
+@pytest.fixture(scope="session")
+def ui_client() -> Iterator[TestClient]:
+    """One FastAPI test client per session; data paths are patched per test."""
+    from ui import server
+
+    with TestClient(server.app) as client:
+        yield client
+
+
 def _prepare_ui_dirs(
     tmp_path: Path,
     fake_umg_csv: Path,
@@ -38,6 +49,7 @@ def _prepare_ui_dirs(
     monkeypatch.setattr(data_access, "WEATHER_DIR", weather_dir)
     monkeypatch.setattr(data_access, "FORECASTS_DIR", weather_dir)
     monkeypatch.setattr(data_access, "RESAMPLE_RULE", "5min")
+    monkeypatch.setattr(data_access, "SIDECAR_DIR", tmp_path / "sidecars")
 
     return {
         "janitza": janitza_dir,
@@ -45,14 +57,12 @@ def _prepare_ui_dirs(
     }
 
 
-def test_ui_endpoints(monkeypatch, tmp_path, fake_umg_csv, fake_weather_parquet) -> None:
+def test_ui_endpoints(ui_client: TestClient, monkeypatch, tmp_path, fake_umg_csv, fake_weather_parquet) -> None:
     """Exercise primary UI routes using synthetic data."""
-    from ui import server
-
     logger.info("Running UI endpoint tests")
 
-    _prepare_ui_dirs(tmp_path, fake_umg_csv, fake_weather_parquet, monkeypatch)
-    client = TestClient(server.app)
+    dirs = _prepare_ui_dirs(tmp_path, fake_umg_csv, fake_weather_parquet, monkeypatch)
+    client = ui_client
 
     resp = client.get("/ui")
     assert resp.status_code == 200
@@ -67,6 +77,25 @@ def test_ui_endpoints(monkeypatch, tmp_path, fake_umg_csv, fake_weather_parquet)
     assert payload["series"], "Expected Janitza series"
     first_series = payload["series"][0]
     assert first_series["data"], "Series should contain datapoints"
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"] == "private, no-cache"
+    resp = client.get(
+        "/ui/api/janitza",
+        params={"start": start, "end": end, "metrics": metrics},
+        headers={"If-None-Match": etag},
+    )
+    assert resp.status_code == 304
+    # An older file appearing leaves the newest mtime alone but still changes the data.
+    backfill = dirs["janitza"] / "measurements_20231231.csv"
+    backfill.write_bytes(Path(fake_umg_csv).read_bytes())
+    os.utime(backfill, ns=(0, 0))
+    resp = client.get(
+        "/ui/api/janitza",
+        params={"start": start, "end": end, "metrics": metrics},
+        headers={"If-None-Match": etag},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
 
     weather_key = Path(fake_weather_parquet).stem.lower()
     resp = client.get(
@@ -83,3 +112,127 @@ def test_ui_endpoints(monkeypatch, tmp_path, fake_umg_csv, fake_weather_parquet)
     )
     assert resp.status_code == 200
     assert "kW" in resp.text or "Power" in resp.text
+
+
+def test_csv_sidecars_stay_out_of_data_dirs(monkeypatch, tmp_path) -> None:
+    """Parquet copies of CSV sources go to the sidecar cache and follow appends to the CSV."""
+    from ui import data_access
+
+    monkeypatch.setattr(data_access, "SIDECAR_DIR", tmp_path / "sidecars")
+    data_dir = tmp_path / "weather"
+    data_dir.mkdir()
+    csv_path = data_dir / "nowcast.csv"
+    own_parquet = data_dir / "nowcast.parquet"
+    csv_path.write_text("timestamp,temp_C\n2024-01-01T00:00:00Z,1.0\n", encoding="utf-8")
+    own_parquet.write_bytes(b"not a sidecar")
+
+    first = data_access._read_csv_with_sidecar(csv_path)
+    assert sorted(path.name for path in data_dir.iterdir()) == ["nowcast.csv", "nowcast.parquet"]
+    assert own_parquet.read_bytes() == b"not a sidecar"
+    assert data_access._fresh_sidecar(csv_path) is not None
+
+    with csv_path.open("a", encoding="utf-8") as handle:
+        handle.write("2024-01-01T01:00:00Z,2.0\n")
+    assert data_access._fresh_sidecar(csv_path) is None
+    second = data_access._read_csv_with_sidecar(csv_path)
+    assert (len(first), len(second)) == (1, 2)
+    assert len(list((tmp_path / "sidecars").glob("*.parquet"))) == 1
+
+
+def test_janitza_scan_keeps_columns_from_every_file(monkeypatch, tmp_path) -> None:
+    """Metric columns present in only some Janitza files survive the merged sidecar scan."""
+    from ui import data_access
+
+    monkeypatch.setattr(data_access, "SIDECAR_DIR", tmp_path / "sidecars")
+    first = tmp_path / "umg_1.csv"
+    second = tmp_path / "umg_2.csv"
+    first.write_text("timestamp,p\n2024-01-01T00:00:00Z,1.0\n", encoding="utf-8")
+    second.write_text("timestamp,p,q\n2024-01-01T00:05:00Z,2.0,5.0\n", encoding="utf-8")
+    for path in (first, second):
+        data_access._read_csv_with_sidecar(path)
+
+    scanned = data_access._scan_sidecars([first, second])
+    assert scanned is not None
+    assert list(scanned.columns) == ["p", "q"]
+    assert scanned["q"].isna().tolist() == [True, False]
+
+    window_start = pd.Timestamp("2024-01-01T00:05:00Z")
+    windowed = data_access._scan_sidecars([first, second], window_start, window_start, ["q", "absent"])
+    assert list(windowed.columns) == ["q"]
+    assert windowed.index.tolist() == [window_start]
+
+
+def test_csv_time_bounds_cover_unsorted_and_quoted_rows(tmp_path) -> None:
+    """Out-of-order files fall back to a full parse instead of trusting their edge rows."""
+    from ui import data_access
+
+    path = tmp_path / "umg_unsorted.csv"
+    path.write_text(
+        'note,timestamp,p\n'
+        'late,2024-01-03T00:00:00Z,1.0\n'
+        '"backfilled, manual",2024-01-01T00:00:00Z,2.0\n'
+        'early,2024-01-02T00:00:00Z,3.0\n',
+        encoding="utf-8",
+    )
+
+    low, high = data_access._csv_time_bounds(path)
+    assert (low, high) == (pd.Timestamp("2024-01-01T00:00:00Z"), pd.Timestamp("2024-01-03T00:00:00Z"))
+    window = pd.Timestamp("2024-01-01T00:00:00Z")
+    assert data_access._may_overlap(path, window, window + pd.Timedelta(hours=1))
+
+
+def test_latest_row_ignores_tails_of_unordered_files(monkeypatch, tmp_path) -> None:
+    """A file whose last line is not its newest row is answered by a full window load."""
+    from ui import data_access
+
+    monkeypatch.setattr(data_access, "SIDECAR_DIR", tmp_path / "sidecars")
+    path = tmp_path / "umg_unordered.csv"
+    path.write_text(
+        "timestamp,p\n2024-01-03T00:00:00Z,3.0\n2024-01-01T00:00:00Z,1.0\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(data_access, "list_janitza_files", lambda: [path])
+    start = pd.Timestamp("2024-01-01T00:00:00Z").to_pydatetime()
+    end = pd.Timestamp("2024-01-05T00:00:00Z").to_pydatetime()
+
+    assert data_access._latest_row([path], start, end) is None
+    rows = data_access.load_janitza_latest(start, end, ["p"])
+    assert [(row.metric, row.value) for row in rows] == [("p", 3.0)]
+
+
+def test_janitza_scan_reads_parquet_sources_and_naive_sidecars(monkeypatch, tmp_path) -> None:
+    """Native Parquet files need no sidecar, and naive timestamps are filtered as UTC."""
+    from ui import data_access
+
+    monkeypatch.setattr(data_access, "SIDECAR_DIR", tmp_path / "sidecars")
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=4, freq="1h")
+    parquet_path = tmp_path / "umg_1.parquet"
+    pd.DataFrame({"timestamp": index, "p": [1.0, 2.0, 3.0, 4.0]}).to_parquet(parquet_path, index=False)
+    window = (index[1].to_pydatetime(), index[2].to_pydatetime())
+
+    scanned = data_access._scan_sidecars([parquet_path], *window, ["p"])
+    assert scanned is not None
+    assert scanned["p"].tolist() == [2.0, 3.0]
+
+    csv_path = tmp_path / "umg_2.csv"
+    csv_path.write_text(
+        "timestamp,p\n" + "".join(f"{ts:%Y-%m-%dT%H:%M:%S},{value}\n" for ts, value in zip(index, [5, 6, 7, 8])),
+        encoding="utf-8",
+    )
+    data_access._read_csv_with_sidecar(csv_path)
+    scanned = data_access._scan_sidecars([csv_path], *window, ["p"])
+    assert scanned is not None
+    assert scanned.index.tolist() == [index[1], index[2]]
+
+
+def test_metric_columns_leave_out_stored_pandas_indexes(tmp_path) -> None:
+    from ui import data_access
+
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=2, freq="1min", name="recorded_at")
+    named = tmp_path / "umg_named.parquet"
+    pd.DataFrame({"p": [1.0, 2.0]}, index=index).to_parquet(named)
+    unnamed = tmp_path / "umg_unnamed.parquet"
+    pd.DataFrame({"p": [1.0, 2.0], "q": [3.0, 4.0]}, index=index.rename(None)).to_parquet(unnamed)
+
+    assert data_access._metric_columns_cached(data_access._file_signature(named)) == ("p",)
+    assert data_access._metric_columns_cached(data_access._file_signature(unnamed)) == ("p", "q")
@@ -2,45 +2,80 @@
 
 from __future__ import annotations
 
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import numpy as np
 import pandas as pd
+import pytest
+import requests
+from urllib3.util.retry import RequestHistory
 
 from tests.conftest import get_test_logger
-from tests.helpers import FakeProvider
+from tests.helpers import FakeHttpResponse, FakeProvider, MemoryCache
 
-from weather.router import WeatherRouter
+from weather import http as weather_http
+from weather.cache import WeatherCache
+from weather.core import REQUIRED_COLUMNS, ensure_schema, resample_frame, slice_window
+from weather.providers.openmeteo_ecmwf import OpenMeteoECMWFProvider
+from weather.providers.tomorrow_io import TomorrowIOProvider
+from weather import router as weather_router
+from weather.router import WeatherRouter, _merge
 
 logger = get_test_logger(__name__)
 logger.info("Starting tests for weather module")
 
+_REQUIRED = frozenset(REQUIRED_COLUMNS)
+_EXPECTED_HOURLY_COLUMNS = [*REQUIRED_COLUMNS, "source"]
+
+
+_HOURLY_INDEX = pd.date_range("2024-01-01T00:00:00Z", periods=72, freq="1h")
+_HOURLY_STEPS = np.arange(len(_HOURLY_INDEX))
+_HOURLY_TEMPLATE = pd.DataFrame(
+    {
+        "temp_C": 10 + _HOURLY_STEPS,
+        "wind_ms": np.full(len(_HOURLY_INDEX), 3.0),
+        "wind_deg": np.full(len(_HOURLY_INDEX), 180),
+        "clouds_pct": 20 + _HOURLY_STEPS,
+        "humidity": np.full(len(_HOURLY_INDEX), 60),
+        "uvi": np.full(len(_HOURLY_INDEX), 0.5),
+        "ghi_Wm2": 100 + _HOURLY_STEPS,
+    },
+    index=_HOURLY_INDEX,
+)
+
+_NOWCAST_INDEX = pd.date_range("2024-01-01T00:00:00Z", periods=24, freq="15min")
+_NOWCAST_TEMPLATE = pd.DataFrame(
+    {
+        "temp_C": 5 + np.arange(len(_NOWCAST_INDEX)),
+        "wind_ms": np.full(len(_NOWCAST_INDEX), 2.5),
+        "wind_deg": np.full(len(_NOWCAST_INDEX), 90),
+        "clouds_pct": np.full(len(_NOWCAST_INDEX), 50),
+        "humidity": np.full(len(_NOWCAST_INDEX), 55),
+        "uvi": np.full(len(_NOWCAST_INDEX), 0.1),
+        "ghi_Wm2": np.full(len(_NOWCAST_INDEX), 80),
+    },
+    index=_NOWCAST_INDEX,
+)
+
 
 def _hourly_builder(start: pd.Timestamp, end: pd.Timestamp, calls: dict) -> pd.DataFrame:
+    # The template is a fixed 72 h window; a request outside it would silently come back short.
+    assert _HOURLY_INDEX[0] <= pd.Timestamp(start) <= pd.Timestamp(end) <= _HOURLY_INDEX[-1]
     calls["hourly"] = calls.get("hourly", 0) + 1
-    idx = pd.date_range(start, end, freq="1h")
-    data = {
-        "temp_C": [10 + i for i in range(len(idx))],
-        "wind_ms": [3.0] * len(idx),
-        "wind_deg": [180] * len(idx),
-        "clouds_pct": [20 + i for i in range(len(idx))],
-        "humidity": [60] * len(idx),
-        "uvi": [0.5] * len(idx),
-        "ghi_Wm2": [100 + i for i in range(len(idx))],
-    }
-    return pd.DataFrame(data, index=idx)
+    return _HOURLY_TEMPLATE.loc[start:end].copy()
 
 
 def _nowcast_builder(hours: int, calls: dict) -> pd.DataFrame:
+    assert 0 < hours * 4 <= len(_NOWCAST_TEMPLATE)
     calls["nowcast"] = calls.get("nowcast", 0) + 1
-    idx = pd.date_range("2024-01-01T00:00:00Z", periods=hours * 4, freq="15min", tz="UTC")
-    data = {
-        "temp_C": [5 + i for i in range(len(idx))],
-        "wind_ms": [2.5] * len(idx),
-        "wind_deg": [90] * len(idx),
-        "clouds_pct": [50] * len(idx),
-        "humidity": [55] * len(idx),
-        "uvi": [0.1] * len(idx),
-        "ghi_Wm2": [80] * len(idx),
-    }
-    return pd.DataFrame(data, index=idx)
+    return _NOWCAST_TEMPLATE.iloc[: hours * 4].copy()
 
 
 def test_weather_router_caching(monkeypatch) -> None:
@@ -60,16 +95,7 @@ def test_weather_router_caching(monkeypatch) -> None:
 
     hourly = router.get_hourly(start.to_pydatetime(), end.to_pydatetime())
     assert not hourly.empty
-    assert list(hourly.columns) == [
-        "temp_C",
-        "wind_ms",
-        "wind_deg",
-        "clouds_pct",
-        "humidity",
-        "uvi",
-        "ghi_Wm2",
-        "source",
-    ]
+    assert list(hourly.columns) == _EXPECTED_HOURLY_COLUMNS
     assert hourly.index.is_monotonic_increasing
 
     hourly_cached = router.get_hourly(start.to_pydatetime(), end.to_pydatetime())
@@ -78,6 +104,7 @@ def test_weather_router_caching(monkeypatch) -> None:
 
     nowcast = router.get_nowcast(2)
     assert not nowcast.empty
+    assert _REQUIRED.issubset(nowcast.columns)
     assert nowcast.index.is_monotonic_increasing
 
     nowcast_cached = router.get_nowcast(2)
@@ -86,3 +113,341 @@ def test_weather_router_caching(monkeypatch) -> None:
 
     local = router.to_local(hourly)
     assert str(local.index.tz) == "Europe/Bucharest"
+
+
+def test_rate_limited_provider_serves_cache_only() -> None:
+    """After a 429 the provider answers from cache and skips fetches on a miss."""
+    calls: dict[str, int] = {}
+    provider = FakeProvider(
+        name="fake",
+        hourly_builder=lambda start, end: _hourly_builder(start, end, calls),
+    )
+    start = pd.Timestamp("2024-01-01T00:00:00Z")
+    end = start + pd.Timedelta(hours=6)
+    provider.get_hourly(start, end)
+
+    provider.note_rate_limit(SimpleNamespace(status_code=429, headers={"Retry-After": "30"}))
+    assert provider.is_throttled()
+    assert not provider.get_hourly(start, end).data.empty
+    assert provider.get_hourly(start, end + pd.Timedelta(hours=1)).data.empty
+    assert calls["hourly"] == 1
+
+    provider.note_rate_limit(SimpleNamespace(status_code=500, headers={}))
+    assert provider.is_throttled()
+
+
+def test_stale_cache_entry_is_served_while_refreshing() -> None:
+    """Entries past their TTL but within stale_ttl are returned and refreshed in the background."""
+    calls: dict[str, int] = {}
+    provider = FakeProvider(name="fake")
+    start = pd.Timestamp("2024-01-01T00:00:00Z")
+
+    def _fetch() -> pd.DataFrame:
+        return _hourly_builder(start, start + pd.Timedelta(hours=6), calls)
+
+    first = provider.fetch_with_cache("hourly", {"k": 1}, _fetch, ttl=60, stale_ttl=60)
+    # Age the entry past its TTL without leaving the stale window.
+    storage = provider.cache._storage
+    key = next(iter(storage))
+    storage[key] = (time.time() - 30, storage[key][1])
+
+    stale = provider.fetch_with_cache("hourly", {"k": 1}, _fetch, ttl=60, stale_ttl=60)
+    pd.testing.assert_frame_equal(first, stale)
+    deadline = time.time() + 5
+    while storage[key][0] < time.time() and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls["hourly"] == 2
+    assert storage[key][0] > time.time()
+
+
+def test_concurrent_cache_misses_share_one_fetch() -> None:
+    """Callers missing the cache for the same key at the same time trigger a single fetch."""
+    calls: dict[str, int] = {}
+    provider = FakeProvider(name="fake")
+    start = pd.Timestamp("2024-01-01T00:00:00Z")
+    release = threading.Event()
+
+    def _fetch() -> pd.DataFrame:
+        release.wait(5)
+        return _hourly_builder(start, start + pd.Timedelta(hours=6), calls)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(provider.fetch_with_cache, "hourly", {"k": 1}, _fetch, 60) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        frames = [future.result() for future in futures]
+
+    assert calls["hourly"] == 1
+    for frame in frames[1:]:
+        pd.testing.assert_frame_equal(frames[0], frame)
+    assert len({id(frame) for frame in frames}) == len(frames)
+    frames[0].iloc[0, 0] = -1.0
+    assert all(frame.iloc[0, 0] != -1.0 for frame in frames[1:])
+
+
+def _tomorrow_timeline(timestep: str, start: pd.Timestamp, periods: int) -> dict:
+    stamps = pd.date_range(start, periods=periods, freq=timestep.replace("m", "min"))
+    intervals = [
+        {"startTime": stamp.isoformat(), "values": {"temperature": 10.0 + i, "humidity": 50.0}}
+        for i, stamp in enumerate(stamps)
+    ]
+    return {"timestep": timestep, "intervals": intervals}
+
+
+def test_tomorrow_prefetch_fills_hourly_and_nowcast_with_one_request() -> None:
+    """A prefetch asks for both timesteps at once; the following reads are served from cache."""
+    now = pd.Timestamp.now(tz="UTC")
+    requests_made: list[dict] = []
+
+    def _post(url, *, params, data, headers, timeout):
+        requests_made.append(json.loads(data))
+        timelines = [
+            _tomorrow_timeline("1h", now.floor("1h"), 48),
+            _tomorrow_timeline("15m", now.floor("15min") - pd.Timedelta(minutes=15), 12),
+        ]
+        return FakeHttpResponse({"data": {"timelines": timelines}})
+
+    provider = TomorrowIOProvider(
+        latitude=44.0,
+        longitude=26.0,
+        api_key="test-key",
+        cache=MemoryCache(),
+        session=SimpleNamespace(post=_post),
+    )
+    end = now + pd.Timedelta(hours=24)
+    provider.prefetch(now.to_pydatetime(), end.to_pydatetime(), 2)
+    hourly = provider.get_hourly(now.to_pydatetime(), end.to_pydatetime())
+    nowcast = provider.get_nowcast(2)
+    provider.prefetch(now.to_pydatetime(), end.to_pydatetime(), 2)
+
+    assert len(requests_made) == 1
+    assert requests_made[0]["timesteps"] == ["1h", "15m"]
+    assert not hourly.data.empty
+    assert not nowcast.data.empty
+
+
+def _drive_lookups(provider, hits: int, misses: int) -> None:
+    for hit in [True] * hits + [False] * misses:
+        provider._record_lookup("hourly", hit)
+
+
+def test_adaptive_ttl_follows_miss_rate_per_window() -> None:
+    """Each 100-lookup window grows the TTL on >30% misses, shrinks it on <5%, else keeps it."""
+    provider = OpenMeteoECMWFProvider(latitude=44.0, longitude=26.0, cache=MemoryCache(), session=SimpleNamespace())
+    assert provider.ttl_for("hourly") == 3600
+
+    _drive_lookups(provider, hits=0, misses=99)
+    assert provider.ttl_for("hourly") == 3600, "no change before the window fills"
+    _drive_lookups(provider, hits=0, misses=1)
+    assert provider.ttl_for("hourly") == 4320
+
+    _drive_lookups(provider, hits=69, misses=30)
+    _drive_lookups(provider, hits=1, misses=0)
+    assert provider.ttl_for("hourly") == 4320, "exactly 30% misses is inside the dead band"
+
+    _drive_lookups(provider, hits=100, misses=0)
+    assert provider.ttl_for("hourly") == int(4320 * 0.9)
+
+
+def test_adaptive_ttl_stays_within_half_and_double_the_update_interval() -> None:
+    provider = OpenMeteoECMWFProvider(latitude=44.0, longitude=26.0, cache=MemoryCache(), session=SimpleNamespace())
+    for _ in range(10):
+        _drive_lookups(provider, hits=0, misses=100)
+    assert provider.ttl_for("hourly") == 7200
+    for _ in range(20):
+        _drive_lookups(provider, hits=100, misses=0)
+    assert provider.ttl_for("hourly") == 1800
+
+    pinned = OpenMeteoECMWFProvider(
+        latitude=44.0, longitude=26.0, ttl=600, cache=MemoryCache(), session=SimpleNamespace()
+    )
+    _drive_lookups(pinned, hits=0, misses=100)
+    assert pinned.ttl_for("hourly") == 600, "an explicit TTL is never adapted"
+
+
+def test_jittered_backoff_is_bounded_by_the_capped_exponential(monkeypatch) -> None:
+    """Retry n sleeps uniform(0, min(cap, backoff * 2**(n-1))); redirects reset the streak."""
+    retry = weather_http.make_retry(attempts=10, backoff=1.0, cap=5.0)
+    failure = RequestHistory("GET", "/", None, 503, None)
+    redirect = RequestHistory("GET", "/", None, 302, "/moved")
+
+    assert retry.get_backoff_time() == 0.0
+    monkeypatch.setattr(weather_http.random, "random", lambda: 1.0)
+    ceilings = [retry.new(history=(failure,) * n).get_backoff_time() for n in range(1, 6)]
+    assert ceilings == [1.0, 2.0, 4.0, 5.0, 5.0]
+    assert retry.new(history=(failure, failure, redirect, failure)).get_backoff_time() == 1.0
+
+    monkeypatch.setattr(weather_http.random, "random", lambda: 0.25)
+    assert retry.new(history=(failure,) * 3).get_backoff_time() == 1.0
+
+
+def test_retry_after_accepts_seconds_and_http_dates() -> None:
+    parse = weather_http.retry_after_seconds
+    assert parse(None) is None
+    assert parse("soon") is None
+    assert parse(" 30 ") == 30.0
+    assert parse("3600") == weather_http.RETRY_AFTER_MAX
+    assert parse("3600", cap=7200) == 3600.0
+
+    now = datetime.now(timezone.utc)
+    assert 25.0 <= parse(format_datetime(now + timedelta(seconds=30), usegmt=True)) <= 30.0
+    assert parse(format_datetime(now - timedelta(minutes=5), usegmt=True)) == 0.0
+    assert parse(format_datetime(now + timedelta(hours=2), usegmt=True)) == weather_http.RETRY_AFTER_MAX
+
+
+def test_injected_session_is_used_as_is_without_retries() -> None:
+    """Only the default session gets the retrying adapter; a caller's session is not modified."""
+    calls = []
+
+    def _get(*args, **kwargs):
+        calls.append(kwargs)
+        raise requests.ConnectionError("down")
+
+    session = requests.Session()
+    session.get = _get
+    provider = OpenMeteoECMWFProvider(latitude=44.0, longitude=26.0, cache=MemoryCache(), session=session)
+    assert provider.session is session
+    assert not isinstance(session.get_adapter(provider.API_ENDPOINT).max_retries, weather_http.JitteredRetry)
+    with pytest.raises(RuntimeError):
+        provider._request()
+    assert len(calls) == 1
+
+    default = OpenMeteoECMWFProvider(latitude=44.0, longitude=26.0, cache=MemoryCache())
+    retry = default.session.get_adapter(default.API_ENDPOINT).max_retries
+    assert isinstance(retry, weather_http.JitteredRetry)
+    assert retry.total == default.retries - 1
+
+
+def _pandas_resample(frame: pd.DataFrame, freq: str, method: str) -> pd.DataFrame:
+    resampler = ensure_schema(frame).resample(freq)
+    if method == "interpolate":
+        return ensure_schema(resampler.interpolate(method="time"))
+    return ensure_schema(getattr(resampler, method)())
+
+
+@pytest.mark.parametrize("unit", ["s", "ns"])
+@pytest.mark.parametrize("freq", ["15min", "1h"])
+def test_interpolate_fast_path_matches_pandas_time_interpolation(unit: str, freq: str) -> None:
+    """Irregular stamps, leading/interior/trailing gaps: same grid and values as pandas."""
+    index = pd.DatetimeIndex(
+        ["2024-01-01T00:07Z", "2024-01-01T00:50Z", "2024-01-01T02:20Z", "2024-01-01T05:05Z"]
+    ).as_unit(unit)
+    frame = pd.DataFrame(
+        {column: np.arange(1.0, 5.0) * (position + 1) for position, column in enumerate(REQUIRED_COLUMNS)},
+        index=index,
+    )
+    frame.iloc[0, 0] = np.nan
+    frame.iloc[2, 1] = np.nan
+    frame.iloc[3, 2] = np.nan
+    frame.iloc[:, 3] = np.nan
+
+    expected = _pandas_resample(frame, freq, "interpolate")
+    pd.testing.assert_frame_equal(resample_frame(frame, freq, "interpolate"), expected)
+
+
+@pytest.mark.parametrize("method", ["nearest", "interpolate"])
+def test_on_grid_passthrough_matches_a_real_resample(method: str) -> None:
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=6, freq="1h")
+    frame = pd.DataFrame({column: np.linspace(0.0, 5.0, 6) for column in REQUIRED_COLUMNS}, index=index)
+
+    pd.testing.assert_frame_equal(resample_frame(frame, "1h", method), _pandas_resample(frame, "1h", method))
+
+    shifted = frame.set_axis(index + pd.Timedelta(minutes=30))
+    gapped = frame.drop(index[2])
+    holed = frame.copy()
+    holed.iloc[2, 0] = np.nan
+    for variant in (shifted, gapped, holed):
+        pd.testing.assert_frame_equal(resample_frame(variant, "1h", method), _pandas_resample(variant, "1h", method))
+
+
+@pytest.mark.parametrize("unit", ["s", "ms", "ns"])
+def test_slice_window_bisect_matches_a_boolean_mask(unit: str) -> None:
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=48, freq="30min", unit=unit)
+    frame = pd.DataFrame({"value": np.arange(48.0)}, index=index)
+    tick = pd.Timedelta(1, unit="ns")
+    bounds = [
+        (None, None),
+        (index[0], index[-1]),
+        (index[5], index[5]),
+        (index[5] - tick, index[9] + tick),
+        (index[5] + tick, index[9] - tick),
+        (index[0] - pd.Timedelta(days=1), index[3]),
+        (index[-3], index[-1] + pd.Timedelta(days=1)),
+        (index[9], index[5]),
+        ("2024-01-01T03:00:00Z", None),
+        (None, pd.Timestamp("2024-01-01 05:00", tz="Europe/Bucharest")),
+    ]
+    for start, end in bounds:
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= index <= pd.Timestamp(end)
+        pd.testing.assert_frame_equal(slice_window(frame, start, end), frame.loc[mask])
+
+    for sliced in (frame, frame.iloc[::-1]):
+        with pytest.raises(TypeError):
+            slice_window(sliced, pd.Timestamp("2024-01-01 03:00"))
+    with pytest.raises(TypeError):
+        slice_window(frame.tz_localize(None), None, index[3])
+
+
+def test_merge_prefers_higher_priority_provider_per_cell() -> None:
+    """Partially overlapping providers: each cell from the first provider with a value."""
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=7, freq="1h")
+    high = pd.DataFrame({column: np.full(5, 1.0) for column in REQUIRED_COLUMNS}, index=index[:5])
+    high.loc[index[1], "wind_ms"] = np.nan
+    high.loc[index[3], "temp_C"] = np.nan
+    high.loc[index[4]] = np.nan
+    low = pd.DataFrame({column: np.full(4, 2.0) for column in REQUIRED_COLUMNS}, index=index[3:])
+    low.loc[index[4]] = np.nan
+
+    merged = _merge([("high", high), ("low", low)])
+
+    assert merged.index.equals(index)
+    assert merged["source"].dtype == pd.CategoricalDtype(["high", "low"])
+    expected_source = pd.Categorical(["high", "high", "high", "high", None, "low", "low"], categories=["high", "low"])
+    pd.testing.assert_series_equal(merged["source"], pd.Series(expected_source, index=index, name="source"))
+    expected_temp = [1.0, 1.0, 1.0, 2.0, np.nan, 2.0, 2.0]
+    pd.testing.assert_series_equal(merged["temp_C"], pd.Series(expected_temp, index=index, name="temp_C"))
+    assert np.isnan(merged.loc[index[1], "wind_ms"])
+    assert merged.loc[index[3], "wind_ms"] == 1.0
+
+
+@pytest.mark.parametrize("method", ["nearest", "interpolate"])
+def test_calendar_frequencies_skip_the_fixed_step_fast_paths(method: str) -> None:
+    index = pd.date_range("2024-01-01T00:00:00Z", periods=5, freq="MS")
+    frame = pd.DataFrame({column: np.arange(5.0) for column in REQUIRED_COLUMNS}, index=index)
+
+    pd.testing.assert_frame_equal(resample_frame(frame, "MS", method), _pandas_resample(frame, "MS", method))
+
+
+def test_sqlite_cache_is_shared_across_threads_and_closes_all_connections(tmp_path) -> None:
+    frame = pd.DataFrame({"temp_C": [1.0, 2.0]})
+
+    memory = WeatherCache(":memory:")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(memory.set, "fake", "hourly", "key", frame, 60).result()
+        pd.testing.assert_frame_equal(executor.submit(memory.get, "fake", "hourly", "key").result(), frame)
+    pd.testing.assert_frame_equal(memory.get("fake", "hourly", "key"), frame)
+    memory.close()
+
+    on_disk = WeatherCache(tmp_path / "cache.sqlite")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(on_disk.set, "fake", "hourly", "key", frame, 60).result()
+    assert len(on_disk._conns) == 2
+    on_disk.close()
+    assert on_disk._conns == []
+    pd.testing.assert_frame_equal(on_disk.get("fake", "hourly", "key"), frame)
+    on_disk.close()
+
+
+def test_weather_config_cache_keeps_one_entry_per_file(tmp_path) -> None:
+    config = tmp_path / "weather.yaml"
+    config.write_text("location:\n  lat: 44.0\n", encoding="utf-8")
+    assert weather_router.load_weather_config(config)["location"]["lat"] == 44.0
+
+    config.write_text("location:\n  lat: 45.5\n", encoding="utf-8")
+    os.utime(config, ns=(config.stat().st_atime_ns, config.stat().st_mtime_ns + 1_000_000_000))
+    assert weather_router.load_weather_config(config)["location"]["lat"] == 45.5
+    assert sum(str(config.resolve()) in str(key) for key in weather_router._CONFIG_CACHE) == 1
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import csv
+import hashlib
+import io
 import json
 import logging
-from datetime import datetime, timedelta
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from dateutil import tz
 
 from . import APP_ROOT
 from .schemas import MetricRow, SeriesPayload, SeriesPoint, SeriesResponse
@@ -23,9 +29,12 @@ JANITZA_DIRS = [
 ]
 WEATHER_DIR = APP_ROOT / "data" / "weather"
 FORECASTS_DIR = APP_ROOT / "data" / "forecasts"
+# Parquet copies of CSV sources; kept apart from the data directories the UI only reads.
+SIDECAR_DIR = APP_ROOT / ".cache" / "ui_parquet"
 RESAMPLE_RULE = "5min"
+MAX_LOAD_WORKERS = 16
 
-UTC = tz.gettz("UTC")
+UTC = timezone.utc
 
 PALETTE = [
     "#0062ff",
@@ -60,6 +69,9 @@ PALETTE = [
     "#ffadad",
     "#6f45c5",
 ]
+# Immutable snapshot indexed per series; avoids re-measuring the list in hot loops.
+_PALETTE = tuple(PALETTE)
+_PALETTE_LEN = len(_PALETTE)
 
 
 def _iter_existing_files(paths: Iterable[Path]) -> List[Path]:
@@ -80,19 +92,84 @@ def _file_signature(path: Path) -> Tuple[str, float]:
     return (str(path), stat.st_mtime)
 
 
+def files_fingerprint(paths: Iterable[Path]) -> Tuple[Tuple[str, int, int], ...]:
+    """Sorted ``(path, mtime_ns, size)`` of every existing file in ``paths``.
+
+    Changes whenever any file is added, removed, rewritten or replaced, not only the newest.
+    """
+    entries = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def _sidecar_prefix(path: Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+def _sidecar_path(path: Path, stat: os.stat_result) -> Path:
+    """Parquet copy of ``path`` for the file state described by ``stat`` (mtime and size)."""
+    return SIDECAR_DIR / f"{_sidecar_prefix(path)}-{stat.st_mtime_ns}-{stat.st_size}.parquet"
+
+
+def _fresh_sidecar(path: Path) -> Optional[Path]:
+    """Return the sidecar built from the current contents of ``path``, if there is one."""
+    try:
+        sidecar = _sidecar_path(path, path.stat())
+    except OSError:
+        return None
+    return sidecar if sidecar.exists() else None
+
+
+def _write_sidecar(path: Path, stat: os.stat_result, df: pd.DataFrame) -> None:
+    """Store ``df`` as the sidecar for ``stat`` unless ``path`` changed while it was read."""
+    current = path.stat()
+    if (current.st_mtime_ns, current.st_size) != (stat.st_mtime_ns, stat.st_size):
+        return
+    sidecar = _sidecar_path(path, stat)
+    SIDECAR_DIR.mkdir(parents=True, exist_ok=True)
+    partial = sidecar.with_name(f"{sidecar.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    df.to_parquet(partial, engine="pyarrow", compression="zstd", index=False)
+    os.replace(partial, sidecar)
+    for stale in SIDECAR_DIR.glob(f"{_sidecar_prefix(path)}-*.parquet"):
+        if stale != sidecar:
+            stale.unlink(missing_ok=True)
+
+
+def _read_csv_with_sidecar(path: Path) -> pd.DataFrame:
+    """Read ``path`` via its cached Parquet copy, creating one for the current file state."""
+    stat = path.stat()
+    sidecar = _sidecar_path(path, stat)
+    if sidecar.exists():
+        return pd.read_parquet(sidecar, engine="pyarrow")
+    try:
+        df = pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(path)
+    try:
+        _write_sidecar(path, stat, df)
+    except (ImportError, OSError, ValueError) as exc:
+        LOGGER.debug("Could not write Parquet sidecar for %s: %s", path, exc)
+    return df
+
+
 @lru_cache(maxsize=128)
 def _load_dataframe(signature: Tuple[str, float]) -> pd.DataFrame:
-    path_str, _ = signature
-    path = Path(path_str)
+    path = Path(signature[0])
     if path.suffix.lower() == ".parquet":
-        df = pd.read_parquet(path)
+        df = pd.read_parquet(path, engine="pyarrow")
     else:
-        df = pd.read_csv(path)
+        df = _read_csv_with_sidecar(path)
     return df
 
 
 def _load_cached(path: Path) -> pd.DataFrame:
-    return _load_dataframe(_file_signature(path)).copy()
+    """Return the shared cached frame for ``path``; callers must not mutate it in place."""
+    return _load_dataframe(_file_signature(path))
 
 
 def list_janitza_files() -> List[Path]:
@@ -105,8 +182,23 @@ def list_janitza_files() -> List[Path]:
     return sorted(files)
 
 
-def list_weather_files() -> Dict[str, Path]:
-    files = _iter_existing_files([WEATHER_DIR, FORECASTS_DIR])
+def _directory_signature(roots: Iterable[Path]) -> Tuple[Tuple[str, float], ...]:
+    """Return ``(path, mtime)`` for each existing directory below ``roots`` (files are not stat'ed)."""
+    signature: List[Tuple[str, float]] = []
+    pending = [Path(root) for root in roots]
+    while pending:
+        directory = pending.pop()
+        try:
+            signature.append((str(directory), directory.stat().st_mtime))
+            pending.extend(entry for entry in directory.iterdir() if entry.is_dir())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return tuple(signature)
+
+
+@lru_cache(maxsize=4)
+def _weather_files_cached(roots: Tuple[str, ...], signature: Tuple[Tuple[str, float], ...]) -> Dict[str, Path]:
+    files = _iter_existing_files([Path(root) for root in roots])
     mapping: Dict[str, Path] = {}
     for path in files:
         key = path.stem.lower()
@@ -114,12 +206,18 @@ def list_weather_files() -> Dict[str, Path]:
     return mapping
 
 
+def list_weather_files() -> Dict[str, Path]:
+    roots = (WEATHER_DIR, FORECASTS_DIR)
+    mapping = _weather_files_cached(tuple(str(root) for root in roots), _directory_signature(roots))
+    return dict(mapping)
+
+
 def _ensure_timestamp(df: pd.DataFrame) -> pd.DataFrame:
     if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
+        df = df.assign(timestamp=pd.to_datetime(df["timestamp"], utc=True, errors="coerce"))
         df = df.dropna(subset=["timestamp"]).set_index("timestamp")
     elif isinstance(df.index, pd.DatetimeIndex):
-        df = df.copy()
+        df = df.copy(deep=False)
         if df.index.tz is None:
             df.index = df.index.tz_localize("UTC")
         else:
@@ -130,53 +228,363 @@ def _ensure_timestamp(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+_UNIT_MATCHERS = {
+    "prefix": str.startswith,
+    "suffix": str.endswith,
+    "contains": str.__contains__,
+}
+# Evaluated in order; the first match wins (e.g. "power_factor" resolves to kW).
+_UNIT_RULES: Tuple[Tuple[str, str, str], ...] = (
+    ("prefix", "power_", "kW"),
+    ("prefix", "p_", "kW"),
+    ("prefix", "q_", "kvar"),
+    ("contains", "reactive", "kvar"),
+    ("prefix", "s_", "kVA"),
+    ("contains", "apparent", "kVA"),
+    ("contains", "voltage", "V"),
+    ("prefix", "u", "V"),
+    ("contains", "current", "A"),
+    ("prefix", "i", "A"),
+    ("contains", "freq", "Hz"),
+    ("contains", "pf", "1"),
+    ("contains", "factor", "1"),
+    ("contains", "thd", "%"),
+    ("suffix", "pct", "%"),
+    ("contains", "percent", "%"),
+    ("suffix", "_c", "°C"),
+    ("suffix", "_ms", "m/s"),
+    ("suffix", "ghi_wm2", "W/m²"),
+    ("contains", "irradiance", "W/m²"),
+)
+
+
+@lru_cache(maxsize=256)
 def _infer_unit(column: str) -> str:
     name = column.lower()
-    if name.startswith("power_") or name.startswith("p_"):
-        return "kW"
-    if name.startswith("q_") or "reactive" in name:
-        return "kvar"
-    if name.startswith("s_") or "apparent" in name:
-        return "kVA"
-    if "voltage" in name or name.startswith("u"):
-        return "V"
-    if "current" in name or name.startswith("i"):
-        return "A"
-    if "freq" in name:
-        return "Hz"
-    if "pf" in name or "factor" in name:
-        return "1"
-    if "thd" in name:
-        return "%"
-    if name.endswith("pct") or "percent" in name:
-        return "%"
-    if name.endswith("_c"):
-        return "°C"
-    if name.endswith("_ms"):
-        return "m/s"
-    if name.endswith("ghi_wm2") or "irradiance" in name:
-        return "W/m²"
+    for kind, token, unit in _UNIT_RULES:
+        if _UNIT_MATCHERS[kind](name, token):
+            return unit
     return ""
 
 
-def _clip_today(df: pd.DataFrame, end: datetime) -> pd.DataFrame:
-    now_utc = datetime.now(tz=UTC)
+def _fast_window(df: pd.DataFrame, start: Optional[datetime], end: Optional[datetime]) -> pd.DataFrame:
+    """Equivalent of ``df.loc[start:end]`` that bisects sorted indexes instead of label slicing."""
+    index = df.index
+    if not index.is_monotonic_increasing:
+        return df.loc[start:end]
+    lo = 0 if start is None else index.searchsorted(start, side="left")
+    hi = len(index) if end is None else index.searchsorted(end, side="right")
+    return df.iloc[lo:hi]
+
+
+def _clip_today(df: pd.DataFrame, end: datetime, now: Optional[datetime] = None) -> pd.DataFrame:
+    now_utc = now if now is not None else datetime.now(tz=UTC)
     if end.date() >= now_utc.date():
         clip_to = min(now_utc, end)
-        df = df.loc[:clip_to]
+        df = _fast_window(df, None, clip_to)
     return df
 
 
 def _resample(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
     if df.empty:
         return df
-    df = df.loc[start:end]
+    df = _fast_window(df, start, end)
     if df.empty:
         return df
     df = df.resample(RESAMPLE_RULE).mean()
     return df
 
 
+def _series_points(column: pd.Series) -> List[SeriesPoint]:
+    """Convert a UTC-indexed series to chart points without per-row pandas scalar access."""
+    ts_ms = (column.index.as_unit("ns").asi8 // 1_000_000).tolist()
+    values = column.to_numpy(dtype=float, na_value=np.nan)
+    # Object array of Python floats with NaN replaced by None, converted in C.
+    py_values = np.where(np.isnan(values), None, values).tolist()
+    return [SeriesPoint.model_construct(timestamp=ts, value=value) for ts, value in zip(ts_ms, py_values)]
+
+
+def _parquet_time_bounds(path: Path) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_metadata(path)
+    names = metadata.schema.names
+    if "timestamp" not in names:
+        return None
+    column = names.index("timestamp")
+    lows: List[pd.Timestamp] = []
+    highs: List[pd.Timestamp] = []
+    for group in range(metadata.num_row_groups):
+        stats = metadata.row_group(group).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        lows.append(pd.Timestamp(stats.min))
+        highs.append(pd.Timestamp(stats.max))
+    if not lows:
+        return None
+    return min(lows), max(highs)
+
+
+def _csv_time_bounds(path: Path) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Bounds from the first and last data rows, or a full column parse when those disagree.
+
+    Appended logs are chronological, so their edge rows are the bounds; a file whose first
+    row is later than its last, or whose edge rows do not parse, is scanned in full.
+    """
+    with path.open("rb") as handle:
+        header = next(csv.reader([handle.readline().decode("utf-8-sig")]), [])
+        if "timestamp" not in header:
+            return None
+        column = header.index("timestamp")
+        first = handle.readline()
+        handle.seek(0, 2)
+        size = handle.tell()
+        handle.seek(max(0, size - 4096))
+        tail = [line for line in handle.read().splitlines() if line.strip()]
+    if not first.strip() or not tail:
+        return None
+    try:
+        edges = list(csv.reader([first.decode("utf-8"), tail[-1].decode("utf-8")]))
+        stamps = pd.to_datetime([edges[0][column], edges[1][column]], utc=True)
+    except (IndexError, UnicodeDecodeError, ValueError):
+        stamps = None
+    if stamps is not None and not stamps.hasnans and stamps[0] <= stamps[1]:
+        return stamps[0], stamps[1]
+    values = pd.to_datetime(pd.read_csv(path, usecols=["timestamp"])["timestamp"], utc=True, errors="coerce")
+    if values.isna().all():
+        return None
+    return values.min(), values.max()
+
+
+@lru_cache(maxsize=1024)
+def _file_time_bounds(signature: Tuple[str, float]) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return the (min, max) UTC timestamps of a file without loading it, when cheaply knowable."""
+    path = Path(signature[0])
+    try:
+        if path.suffix.lower() == ".parquet":
+            bounds = _parquet_time_bounds(path)
+        else:
+            sidecar = _fresh_sidecar(path)
+            if sidecar is not None:
+                bounds = _parquet_time_bounds(sidecar)
+            else:
+                bounds = _csv_time_bounds(path)
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.debug("Could not read time bounds for %s: %s", path, exc)
+        return None
+    if bounds is None:
+        return None
+    low, high = (ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC") for ts in bounds)
+    return low, high
+
+
+def _read_last_row(path: Path) -> Optional[pd.DataFrame]:
+    """Return the final data row of ``path`` as a one-row timestamp-indexed frame."""
+    sidecar = path if path.suffix.lower() == ".parquet" else _fresh_sidecar(path)
+    if sidecar is not None:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(sidecar)
+        if parquet.metadata.num_rows == 0:
+            return None
+        groups = [g for g in range(parquet.num_row_groups) if parquet.metadata.row_group(g).num_rows]
+        group = parquet.read_row_group(groups[-1])
+        tail = group.slice(group.num_rows - 1).to_pandas()
+    else:
+        with path.open("rb") as handle:
+            header = handle.readline()
+            handle.seek(0, 2)
+            size = handle.tell()
+            handle.seek(max(len(header), size - 4096))
+            lines = [line for line in handle.read().splitlines() if line.strip()]
+        if not lines:
+            return None
+        tail = pd.read_csv(io.BytesIO(header + lines[-1] + b"\n"))
+    tail = _ensure_timestamp(tail)
+    return None if tail.empty else tail
+
+
+@lru_cache(maxsize=1024)
+def _last_row(signature: Tuple[str, float]) -> Optional[pd.DataFrame]:
+    try:
+        return _read_last_row(Path(signature[0]))
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.debug("Could not read last row of %s: %s", signature[0], exc)
+        return None
+
+
+def _latest_row(files: Sequence[Path], start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+    """Newest row in ``[start, end]`` from file tails, or ``None`` when tails cannot decide it.
+
+    Files are visited newest first. The answer is only taken from tails when no file
+    continues past ``end`` and every tail is its file's newest row; otherwise an in-window
+    row may sit mid-file and the caller has to fall back to a full window load.
+    """
+    latest: Optional[pd.DataFrame] = None
+    for path in sorted(files, key=lambda p: p.stat().st_mtime, reverse=True):
+        if not _may_overlap(path, start, end):
+            continue
+        signature = _file_signature(path)
+        tail = _last_row(signature)
+        if tail is None or tail.index[-1] > end:
+            return None
+        bounds = _file_time_bounds(signature)
+        if bounds is None or tail.index[-1] != bounds[1]:
+            return None
+        if latest is None or tail.index[-1] > latest.index[-1]:
+            latest = tail
+    if latest is not None and latest.index[-1] < start:
+        return latest.iloc[:0]
+    return latest
+
+
+def _may_overlap(path: Path, start: datetime, end: datetime) -> bool:
+    bounds = _file_time_bounds(_file_signature(path))
+    if bounds is None:
+        return True
+    low, high = bounds
+    return not (high < start or low > end)
+
+
+def _scan_sidecars(
+    files: Sequence[Path],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    metrics: Optional[Sequence[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """Scan Parquet files and fresh CSV sidecars in one multi-threaded dataset, or ``None`` if unavailable.
+
+    The ``[start, end]`` window and the ``metrics`` projection are pushed down into the scan,
+    so only matching row groups and columns are read.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError:  # pragma: no cover - pyarrow is a hard requirement
+        return None
+
+    sidecars: List[str] = []
+    for path in files:
+        sidecar = path if path.suffix.lower() == ".parquet" else _fresh_sidecar(path)
+        if sidecar is None:
+            return None
+        sidecars.append(str(sidecar))
+
+    try:
+        # The dataset would otherwise take its schema from the first file and drop metric
+        # columns that only later files carry; conflicting types raise and fall back.
+        schema = pa.unify_schemas([pq.read_schema(sidecar) for sidecar in sidecars])
+        dataset = ds.dataset(sidecars, format="parquet", schema=schema)
+        if "timestamp" not in schema.names or not pa.types.is_timestamp(schema.field("timestamp").type):
+            return None
+        stamp_type = schema.field("timestamp").type
+
+        def _bound(value: datetime) -> pa.Scalar:
+            # Naive columns hold UTC wall times (see _ensure_timestamp); compare like with like.
+            ts = pd.Timestamp(value).tz_convert("UTC")
+            if stamp_type.tz is None:
+                ts = ts.tz_localize(None)
+            return pa.scalar(ts.to_pydatetime(), type=stamp_type)
+
+        columns = None if metrics is None else ["timestamp", *[name for name in metrics if name in schema.names]]
+        window = None
+        if start is not None:
+            window = ds.field("timestamp") >= _bound(start)
+        if end is not None:
+            upper = ds.field("timestamp") <= _bound(end)
+            window = upper if window is None else window & upper
+        table = dataset.to_table(columns=columns, filter=window)
+    except (pa.ArrowException, OSError, ValueError, TypeError) as exc:
+        LOGGER.debug("Janitza dataset scan failed, falling back to per-file loads: %s", exc)
+        return None
+    return _ensure_timestamp(table.to_pandas())
+
+
+@lru_cache(maxsize=4)
+def _merged_janitza(signatures: Tuple[Tuple[str, float], ...]) -> Optional[pd.DataFrame]:
+    """Merge the given Janitza files into one time-sorted frame, memoized on their signatures.
+
+    Used when the sidecar scan is unavailable. Repeated dashboard requests over the same
+    files only slice this frame; any file change alters its signature and triggers a rebuild.
+    """
+    files = [Path(path) for path, _ in signatures]
+
+    def _load(path: Path) -> Optional[pd.DataFrame]:
+        try:
+            df = _ensure_timestamp(_load_cached(path))
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Skipping Janitza file %s: %s", path, exc)
+            return None
+        return None if df.empty else df
+
+    if len(files) == 1:
+        loaded = [_load(files[0])]
+    else:
+        # pyarrow/pandas parsing releases the GIL, so threads overlap file reads.
+        with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(files))) as executor:
+            loaded = list(executor.map(_load, files))
+    frames = [df for df in loaded if df is not None]
+
+    if not frames:
+        return None
+    merged = frames[0] if len(frames) == 1 else pd.concat(frames)
+    if not merged.index.is_monotonic_increasing:
+        merged = merged.sort_index()
+    return merged
+
+
+def _load_janitza_window(
+    files: Sequence[Path],
+    start: datetime,
+    end: datetime,
+    metrics: Sequence[str],
+) -> Optional[pd.DataFrame]:
+    """Return Janitza rows within ``[start, end]`` sorted by time, or ``None`` if no file matches."""
+    files = [path for path in files if _may_overlap(path, start, end)]
+    if not files:
+        return None
+    scanned = _scan_sidecars(files, start, end, metrics)
+    if scanned is not None:
+        if not scanned.index.is_monotonic_increasing:
+            scanned = scanned.sort_index()
+        return None if scanned.empty else scanned
+    merged = _merged_janitza(tuple(sorted(_file_signature(path) for path in files)))
+    if merged is None:
+        return None
+    window = _fast_window(merged, start, end)
+    return None if window.empty else window
+
+
+def _resample_arrow(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """Arrow-compute variant of :func:`_resample` for numeric weather columns.
+
+    Rows are bucketed with ``floor_temporal`` and averaged with a single ``group_by``;
+    empty bins are restored afterwards so upsampled series can still be forward-filled.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    window = _fast_window(df, start, end)
+    numeric = [column for column in window.columns if window[column].dtype.kind in "if"]
+    if window.empty or not numeric:
+        return window.loc[:, numeric]
+
+    step_seconds = int(pd.Timedelta(pd.tseries.frequencies.to_offset(RESAMPLE_RULE)).total_seconds())
+    buckets = pc.floor_temporal(pa.array(window.index), multiple=step_seconds, unit="second")
+    # from_pandas=True maps NaN to null so means skip missing values like pandas does.
+    table = pa.table({column: pa.array(window[column].to_numpy(), from_pandas=True) for column in numeric})
+    table = table.append_column("__bucket__", buckets)
+    grouped = table.group_by("__bucket__").aggregate([(column, "mean") for column in numeric])
+
+    result = grouped.to_pandas().set_index("__bucket__").sort_index()
+    result.columns = [column[: -len("_mean")] for column in result.columns]
+    result = result.loc[:, numeric]
+    result = result.reindex(pd.date_range(result.index[0], result.index[-1], freq=RESAMPLE_RULE))
+    result.index.name = window.index.name
+    return result
+
+
 def load_janitza_series(
     start: datetime,
     end: datetime,
@@ -186,22 +594,10 @@ def load_janitza_series(
     if not files or not metrics:
         return SeriesResponse(series=[], meta={"from": start.isoformat(), "to": end.isoformat(), "rows": 0})
 
-    frames: List[pd.DataFrame] = []
-    for path in files:
-        try:
-            df = _ensure_timestamp(_load_cached(path))
-        except Exception as exc:  # noqa: BLE001
-            LOGGER.warning("Skipping Janitza file %s: %s", path, exc)
-            continue
-        if df.index.max() < start or df.index.min() > end:
-            continue
-        frames.append(df)
-
-    if not frames:
+    merged = _load_janitza_window(files, start, end, metrics)
+    if merged is None:
         return SeriesResponse(series=[], meta={"from": start.isoformat(), "to": end.isoformat(), "rows": 0})
 
-    merged = pd.concat(frames).sort_index()
-    merged = merged.loc[start:end]
     merged = _clip_today(merged, end)
     if merged.empty:
         return SeriesResponse(series=[], meta={"from": start.isoformat(), "to": end.isoformat(), "rows": 0})
@@ -212,12 +608,9 @@ def load_janitza_series(
     series_data: List[SeriesPayload] = []
     for idx, column in enumerate(merged.columns):
         unit = _infer_unit(column)
-        color = PALETTE[idx % len(PALETTE)]
-        points = [
-            SeriesPoint(timestamp=int(ts.timestamp() * 1000), value=(None if pd.isna(val) else float(val)))
-            for ts, val in merged[column].items()
-        ]
-        series_data.append(SeriesPayload(name=column, unit=unit, color=color, data=points))
+        color = _PALETTE[idx % _PALETTE_LEN]
+        points = _series_points(merged[column])
+        series_data.append(SeriesPayload.model_construct(name=column, unit=unit, color=color, data=points))
 
     return SeriesResponse(
         series=series_data,
@@ -231,22 +624,17 @@ def load_janitza_latest(
     metrics: Sequence[str],
 ) -> List[MetricRow]:
     files = list_janitza_files()
-    frames: List[pd.DataFrame] = []
-    for path in files:
-        try:
-            df = _ensure_timestamp(_load_cached(path))
-        except Exception:
-            continue
-        frames.append(df)
-    if not frames:
-        return []
-    merged = pd.concat(frames).sort_index()
-    merged = merged.loc[start:end]
-    merged = _clip_today(merged, end)
-    if merged.empty:
+    now = datetime.now(tz=UTC)
+    upper = min(now, end) if end.date() >= now.date() else end
+    latest = _latest_row(files, start, upper)
+    if latest is None:
+        merged = _load_janitza_window(files, start, end, metrics)
+        if merged is None:
+            return []
+        latest = _clip_today(merged, end, now=now).tail(1)
+    if latest.empty:
         return []
     rows: List[MetricRow] = []
-    latest = merged.tail(1)
     for column in metrics:
         if column not in latest.columns:
             continue
@@ -284,7 +672,7 @@ def load_weather_series(
         LOGGER.warning("Failed to load weather %s: %s", path, exc)
         return SeriesResponse(series=[], meta={"from": start.isoformat(), "to": end.isoformat(), "rows": 0})
 
-    df = df.loc[start:end]
+    df = _fast_window(df, start, end)
     df = _clip_today(df, end)
     if df.empty:
         return SeriesResponse(series=[], meta={"from": start.isoformat(), "to": end.isoformat(), "rows": 0})
@@ -308,20 +696,25 @@ def load_weather_series(
     }
     for old, new in rename_map.items():
         if old in df.columns and new not in df.columns:
-            df.rename(columns={old: new}, inplace=True)
+            df = df.rename(columns={old: new})
 
-    df = _resample(df, start, end).ffill()
+    try:
+        df = _resample_arrow(df, start, end)
+    except (ImportError, ValueError, TypeError) as exc:
+        LOGGER.debug("Arrow resample unavailable for %s, using pandas: %s", path, exc)
+        df = _resample(df, start, end)
     df = df.loc[:, [col for col in df.columns if df[col].dtype.kind in "if"]]
+    # Only sparse columns (typically upsampled hourly fields) need forward-filling.
+    na_cols = df.columns[df.isna().any()].tolist()
+    if na_cols:
+        df[na_cols] = df[na_cols].ffill()
 
     series_data: List[SeriesPayload] = []
     for idx, column in enumerate(df.columns):
         unit = _infer_unit(column)
-        color = PALETTE[idx % len(PALETTE)]
-        points = [
-            SeriesPoint(timestamp=int(ts.timestamp() * 1000), value=(None if pd.isna(val) else float(val)))
-            for ts, val in df[column].items()
-        ]
-        series_data.append(SeriesPayload(name=column, unit=unit, color=color, data=points))
+        color = _PALETTE[idx % _PALETTE_LEN]
+        points = _series_points(df[column])
+        series_data.append(SeriesPayload.model_construct(name=column, unit=unit, color=color, data=points))
 
     return SeriesResponse(
         series=series_data,
@@ -329,8 +722,9 @@ def load_weather_series(
     )
 
 
-def default_window(range_name: str) -> Tuple[datetime, datetime]:
-    now = datetime.now(tz=UTC)
+def default_window(range_name: str, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    if now is None:
+        now = datetime.now(tz=UTC)
     if range_name == "3days":
         start = now - timedelta(days=3)
     elif range_name == "week":
@@ -344,16 +738,30 @@ def default_window(range_name: str) -> Tuple[datetime, datetime]:
     return start, now
 
 
+@lru_cache(maxsize=4)
+def _metric_columns_cached(signature: Tuple[str, float]) -> Tuple[str, ...]:
+    path = Path(signature[0])
+    sidecar = path if path.suffix.lower() == ".parquet" else _fresh_sidecar(path)
+    if sidecar is not None:
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(sidecar)
+        # Stored pandas indexes appear as columns; RangeIndexes are described by dicts instead.
+        stored_indexes = (schema.pandas_metadata or {}).get("index_columns", [])
+        index_columns = {name for name in stored_indexes if isinstance(name, str)}
+        names = [name for name in schema.names if name not in index_columns]
+    else:
+        names = list(pd.read_csv(path, nrows=0).columns)
+    return tuple(name for name in names if name != "timestamp")
+
+
 def discover_metric_columns() -> List[str]:
     files = list_janitza_files()
     if not files:
         return []
     latest = files[-1]
     try:
-        df = _load_cached(latest)
-        if "timestamp" in df.columns:
-            df = df.drop(columns=["timestamp"])
-        return list(df.columns)
+        return list(_metric_columns_cached(_file_signature(latest)))
     except Exception as exc:  # noqa: BLE001
         LOGGER.warning("Unable to discover metric columns: %s", exc)
         return []
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import threading
 import webbrowser
 from datetime import datetime
 from pathlib import Path
@@ -12,17 +14,29 @@ from typing import List, Optional
 
 from dateutil import parser
 from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from uvicorn import Config, Server
 
 from . import APP_ROOT
-from .data_access import list_weather_files, load_janitza_latest, load_janitza_series, load_weather_series, discover_metric_columns
+from .data_access import (
+    discover_metric_columns,
+    files_fingerprint,
+    list_janitza_files,
+    list_weather_files,
+    load_janitza_latest,
+    load_janitza_series,
+    load_weather_series,
+    resolve_weather_selection,
+)
 from .schemas import SeriesResponse
 
 LOGGER = logging.getLogger(__name__)
 
+# Clients may keep responses but must revalidate them (If-None-Match) on every poll.
+API_CACHE_CONTROL = "private, no-cache"
 TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
@@ -47,6 +61,25 @@ def render_template(name: str, **context) -> HTMLResponse:
     return HTMLResponse(template.render(**context))
 
 
+def _json_response(payload: SeriesResponse, etag: Optional[str] = None) -> Response:
+    """Serialise with pydantic's Rust encoder in one pass (no dict round-trip)."""
+    headers = {"Cache-Control": API_CACHE_CONTROL}
+    if etag:
+        headers["ETag"] = etag
+    return Response(content=payload.model_dump_json(), media_type="application/json", headers=headers)
+
+
+def _series_etag(*parts: object) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": API_CACHE_CONTROL})
+    return None
+
+
 def available_metrics() -> List[str]:
     return discover_metric_columns()
 
@@ -81,6 +114,7 @@ async def ui_controls(
 
 @router.get("/ui/api/janitza", response_class=JSONResponse)
 async def api_janitza(
+    request: Request,
     start: str = Query(...),
     end: str = Query(...),
     metrics: str = Query(""),
@@ -88,10 +122,14 @@ async def api_janitza(
     metric_list = [m.strip() for m in metrics.split(",") if m.strip()]
     if not metric_list:
         return JSONResponse({"series": [], "meta": {}})
+    etag = _series_etag(start, end, ",".join(metric_list), files_fingerprint(list_janitza_files()))
+    cached = _not_modified(request, etag)
+    if cached is not None:
+        return cached
     start_dt = parse_iso(start)
     end_dt = parse_iso(end)
     payload = load_janitza_series(start_dt.astimezone(), end_dt.astimezone(), metric_list)
-    return JSONResponse(payload.model_dump())
+    return _json_response(payload, etag)
 
 
 @router.get("/ui/janitza/table", response_class=HTMLResponse)
@@ -110,17 +148,24 @@ async def janitza_table(
 
 @router.get("/ui/api/weather", response_class=JSONResponse)
 async def api_weather(
+    request: Request,
     type: str = Query(..., alias="type"),
     start: str = Query(...),
     end: str = Query(...),
 ) -> JSONResponse:
+    path = resolve_weather_selection(type)
+    etag = _series_etag(type, start, end, files_fingerprint([path] if path else []))
+    cached = _not_modified(request, etag)
+    if cached is not None:
+        return cached
     start_dt = parse_iso(start)
     end_dt = parse_iso(end)
     payload = load_weather_series(type, start_dt.astimezone(), end_dt.astimezone())
-    return JSONResponse(payload.model_dump())
+    return _json_response(payload, etag)
 
 
 app = FastAPI(title="PROGONZA UI")
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.mount("/ui/static", StaticFiles(directory=STATIC_DIR), name="ui-static")
 app.include_router(router)
 
@@ -139,9 +184,9 @@ def start_ui(host: str, port: int, open_browser: bool = True) -> None:
     if open_browser:
         url = f"http://{host}:{port}/ui"
 
-        def _open() -> None:
-            webbrowser.open(url)
-
-        asyncio.get_event_loop().call_later(1.0, _open)
+        # asyncio.run() creates its own loop, so schedule the browser outside of asyncio.
+        opener = threading.Timer(1.0, webbrowser.open, args=(url,))
+        opener.daemon = True
+        opener.start()
 
     asyncio.run(server.serve())
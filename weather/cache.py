@@ -1,16 +1,21 @@
 """Simple SQLite-based cache for provider responses."""
 from __future__ import annotations
 
+import contextlib
 import io
 import sqlite3
 import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import ContextManager, List, Optional, Tuple
 
 import pandas as pd
+from pyarrow import feather
 
 DEFAULT_CACHE_PATH = Path(".cache") / "weather_cache.sqlite"
+# Feather v2 files start with this magic; older rows hold pickles and are treated as misses.
+_PAYLOAD_MAGIC = b"ARROW1"
+_MMAP_SIZE = 256 * 1024 * 1024
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS weather_cache (
     provider TEXT NOT NULL,
@@ -24,13 +29,19 @@ CREATE TABLE IF NOT EXISTS weather_cache (
 
 
 class WeatherCache:
-    """A tiny sqlite cache storing DataFrames as pickle blobs."""
+    """A tiny sqlite cache storing DataFrames as zstd-compressed Arrow IPC (Feather) blobs."""
 
     def __init__(self, path: Optional[Path | str] = None) -> None:
         self.path = Path(path) if path else DEFAULT_CACHE_PATH
-        if self.path != Path(":memory:"):
+        # Every ":memory:" connection is its own database, so all threads share one
+        # connection and take turns on it; file databases get one connection per thread.
+        self._shared = self.path == Path(":memory:")
+        if not self._shared:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._guard: ContextManager = threading.Lock() if self._shared else contextlib.nullcontext()
         self._ensure_schema()
 
     @classmethod
@@ -38,15 +49,48 @@ class WeatherCache:
         return cls(DEFAULT_CACHE_PATH)
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES)
-
-    def _ensure_schema(self) -> None:
-        with self._connect() as conn:
+        """Return this thread's connection (the shared one for ":memory:"), opening it on first use."""
+        if self._shared and self._conns:
+            return self._conns[0]
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Opened unbound to the thread so close() can release connections of pool threads.
+            conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
             conn.execute(_SCHEMA)
             conn.commit()
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _ensure_schema(self) -> None:
+        self._connect()
+
+    def close(self) -> None:
+        """Close every connection this cache opened, on any thread."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
 
     def get(self, provider: str, scope: str, cache_key: str) -> Optional[pd.DataFrame]:
-        with self._lock, self._connect() as conn:
+        hit = self.lookup(provider, scope, cache_key)
+        return hit[0] if hit is not None else None
+
+    def lookup(
+        self,
+        provider: str,
+        scope: str,
+        cache_key: str,
+        max_stale: float = 0.0,
+    ) -> Optional[Tuple[pd.DataFrame, bool]]:
+        """Return ``(frame, is_stale)``, accepting entries up to ``max_stale`` seconds past expiry."""
+        now = time.time()
+        with self._guard, self._connect() as conn:
             cursor = conn.execute(
                 "SELECT expires_at, payload FROM weather_cache WHERE provider=? AND scope=? AND cache_key=?",
                 (provider, scope, cache_key),
@@ -55,16 +99,16 @@ class WeatherCache:
             if not row:
                 return None
             expires_at, payload = row
-            if expires_at < time.time():
+            if expires_at + max_stale < now:
                 conn.execute(
                     "DELETE FROM weather_cache WHERE provider=? AND scope=? AND cache_key=?",
                     (provider, scope, cache_key),
                 )
                 conn.commit()
                 return None
-        buffer = io.BytesIO(payload)
-        buffer.seek(0)
-        return pd.read_pickle(buffer)
+        if bytes(payload[: len(_PAYLOAD_MAGIC)]) != _PAYLOAD_MAGIC:
+            return None
+        return feather.read_feather(io.BytesIO(payload)), expires_at < now
 
     def set(
         self,
@@ -76,8 +120,8 @@ class WeatherCache:
     ) -> None:
         expires_at = time.time() + ttl_seconds
         payload = io.BytesIO()
-        frame.to_pickle(payload, compression=None)
-        with self._lock, self._connect() as conn:
+        feather.write_feather(frame, payload, compression="zstd", compression_level=3)
+        with self._guard, self._connect() as conn:
             conn.execute(
                 "REPLACE INTO weather_cache (provider, scope, cache_key, expires_at, payload) VALUES (?, ?, ?, ?, ?)",
                 (provider, scope, cache_key, expires_at, payload.getvalue()),
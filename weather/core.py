@@ -2,15 +2,24 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 from zoneinfo import ZoneInfo
 
+from .http import RETRY_AFTER_MAX, retry_after_seconds
+
 if TYPE_CHECKING:
     from .cache import WeatherCache
     from requests import Session as RequestsSession
@@ -18,6 +27,16 @@ else:  # pragma: no cover - used only for typing
     WeatherCache = Any  # type: ignore[assignment]
     RequestsSession = Any  # type: ignore[assignment]
 
+logger = logging.getLogger(__name__)
+
+# Adaptive TTL: judge the miss rate every _TTL_WINDOW lookups and nudge the TTL within
+# [update_interval_s / 2, update_interval_s * 2].
+_TTL_WINDOW = 100
+_TTL_GROW_ABOVE_MISS_RATE = 0.30
+_TTL_SHRINK_BELOW_MISS_RATE = 0.05
+_TTL_GROW_FACTOR = 1.2
+_TTL_SHRINK_FACTOR = 0.9
+
 SessionLike = RequestsSession
 
 DEFAULT_RESAMPLE_METHOD = "nearest"
@@ -30,6 +49,21 @@ REQUIRED_COLUMNS: Sequence[str] = (
     "uvi",
     "ghi_Wm2",
 )
+REQUIRED_COLUMNS_INDEX = pd.Index(REQUIRED_COLUMNS)
+_NS_PER_UNIT = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+
+@lru_cache(maxsize=512)
+def as_utc_timestamp(value: datetime | pd.Timestamp) -> pd.Timestamp:
+    """UTC ``Timestamp`` for ``value``, treating naive inputs as UTC.
+
+    Memoized because schedulers ask for the same window boundaries on every tick;
+    timestamps are immutable, so sharing the cached instances is safe.
+    """
+    ts = pd.Timestamp(value)
+    if ts.tz is None:
+        return ts.tz_localize("UTC")
+    return ts.tz_convert("UTC")
 
 
 def ensure_utc_index(frame: pd.DataFrame) -> pd.DataFrame:
@@ -45,13 +79,18 @@ def ensure_utc_index(frame: pd.DataFrame) -> pd.DataFrame:
         idx = idx.tz_convert("UTC")
 
     working.index = idx
-    working = working.sort_index()
+    # Provider series arrive chronologically; only pay for a sort when they do not.
+    if not idx.is_monotonic_increasing:
+        working = working.sort_index()
     return working
 
 
 def ensure_schema(frame: pd.DataFrame) -> pd.DataFrame:
     """Enforce the standard schema for forecast frames."""
     working = ensure_utc_index(frame)
+    if working.columns.equals(REQUIRED_COLUMNS_INDEX):
+        # ensure_utc_index already returned a copy, so no reselection is needed.
+        return working
     columns = list(REQUIRED_COLUMNS)
     for column in columns:
         if column not in working.columns:
@@ -59,6 +98,45 @@ def ensure_schema(frame: pd.DataFrame) -> pd.DataFrame:
     return working.loc[:, columns]
 
 
+def slice_window(
+    frame: pd.DataFrame,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Return rows with ``start <= index <= end`` (either bound optional).
+
+    Sorted indexes are bisected and sliced positionally; anything else falls back to a mask.
+    """
+    index = frame.index
+    if not index.is_monotonic_increasing:
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index >= start
+        if end is not None:
+            mask &= index <= end
+        return frame.loc[mask]
+    if not isinstance(index, pd.DatetimeIndex):
+        lo = 0 if start is None else index.searchsorted(start, side="left")
+        hi = len(index) if end is None else index.searchsorted(end, side="right")
+        return frame.iloc[lo:hi]
+    # Bisect the raw int64 epochs; bounds are rounded inwards to the index resolution.
+    values = index.asi8
+    ns_per_tick = _NS_PER_UNIT[index.unit]
+    lo, hi = 0, len(values)
+    if start is not None:
+        lo = np.searchsorted(values, -(-_epoch_ns(start, index) // ns_per_tick), side="left")
+    if end is not None:
+        hi = np.searchsorted(values, _epoch_ns(end, index) // ns_per_tick, side="right")
+    return frame.iloc[lo:hi]
+
+
+def _epoch_ns(bound: Any, index: pd.DatetimeIndex) -> int:
+    ts = pd.Timestamp(bound)
+    if (ts.tz is None) != (index.tz is None):
+        raise TypeError("Cannot compare tz-naive and tz-aware datetime-like objects")
+    return ts.as_unit("ns").value
+
+
 def align_frames(frames: Iterable[pd.DataFrame]) -> pd.DatetimeIndex:
     """Return the union of all indices in UTC for downstream alignment."""
     indices = [ensure_utc_index(frame).index for frame in frames if not frame.empty]
@@ -79,13 +157,28 @@ def resample_frame(
     """Resample data to a uniform frequency with time-aware interpolation."""
     if frame.empty:
         return frame
-    working = ensure_schema(frame).copy()
+    working = ensure_schema(frame)
 
     # Ensure all columns are numeric (required columns should be float)
     for col in working.columns:
-        if col in REQUIRED_COLUMNS:
+        if col in REQUIRED_COLUMNS and working[col].dtype != np.float64:
             working[col] = pd.to_numeric(working[col], errors='coerce')
 
+    # Calendar offsets ("MS", "W-MON") have no fixed length; only pandas can bin them.
+    step = _fixed_step(freq)
+    if (
+        step is not None
+        and _on_grid(working.index, step)
+        and bool((working.dtypes == np.float64).all())
+        # Interpolation would also fill interior gaps, so only complete frames pass through.
+        and (method != "interpolate" or not working.isna().to_numpy().any())
+    ):
+        # Already sampled at ``freq`` on its bin edges; resampling would reproduce it.
+        return working
+    if step is not None and method == "interpolate" and limit is None and working.index.is_unique:
+        # ensure_schema fixed the columns and index, so the result needs no second pass.
+        return _interpolate_time(working, step)
+
     resampler = working.resample(freq)
     if method == "nearest":
         resampled = resampler.nearest(limit=limit)
@@ -98,6 +191,47 @@ def resample_frame(
     return ensure_schema(resampled)
 
 
+def _interpolate_time(frame: pd.DataFrame, step: pd.Timedelta) -> pd.DataFrame:
+    """``frame.resample(step).interpolate(method="time")`` for small numeric frames.
+
+    Each column is a single ``np.interp`` over its valid points, skipping pandas'
+    upsample/concat/interpolate round trip. Grid points before a column's first valid
+    value stay NaN; later ones hold the last value, as pandas' forward fill does.
+    """
+    index = frame.index
+    grid = pd.date_range(index[0].floor(step), index[-1].floor(step), freq=step, unit=index.unit)
+    x_old = index.asi8.astype(np.float64)
+    x_new = grid.asi8.astype(np.float64)
+    values = frame.to_numpy(dtype=np.float64)
+    out = np.full((len(grid), values.shape[1]), np.nan)
+    for position in range(values.shape[1]):
+        column = values[:, position]
+        valid = ~np.isnan(column)
+        if not valid.any():
+            continue
+        x_valid = x_old[valid]
+        interpolated = np.interp(x_new, x_valid, column[valid])
+        interpolated[x_new < x_valid[0]] = np.nan
+        out[:, position] = interpolated
+    return pd.DataFrame(out, index=grid, columns=frame.columns)
+
+
+def _fixed_step(freq: str) -> Optional[pd.Timedelta]:
+    """``freq`` as a fixed duration, or ``None`` for calendar offsets."""
+    offset = to_offset(freq)
+    return pd.Timedelta(offset) if isinstance(offset, Tick) else None
+
+
+def _on_grid(index: pd.DatetimeIndex, step: pd.Timedelta) -> bool:
+    """True when ``index`` is gap-free at ``step`` and starts on a ``step`` bin edge."""
+    if index[0] != index[0].floor(step):
+        return False
+    if len(index) == 1:
+        return True
+    deltas = np.diff(index.asi8)
+    return bool((deltas == step.as_unit(index.unit).value).all())
+
+
 def to_local(frame: pd.DataFrame, tz: str) -> pd.DataFrame:
     """Convert a UTC-indexed DataFrame to the configured local timezone."""
     working = ensure_utc_index(frame)
@@ -126,6 +260,10 @@ class Provider(ABC):
     """Base class for all weather providers."""
 
     name: str
+    # Providers that implement get_nowcast override this with True.
+    supports_nowcast: bool = False
+    # How often the upstream data changes, in seconds; the default TTL for providers that set it.
+    update_interval_s: Optional[int] = None
 
     def __init__(
         self,
@@ -136,17 +274,28 @@ class Provider(ABC):
         ttl: Optional[int] = None,
         ttl_scopes: Optional[Dict[str, int]] = None,
         session: Optional[SessionLike] = None,
+        adaptive_ttl: bool = False,
     ) -> None:
         self.name = name
         self.priority = priority
         self._ttl_default = ttl
         self._ttl_scopes = ttl_scopes or {}
+        # Scope TTLs drift with the observed miss rate; only meaningful with a known cadence.
+        self._adaptive_ttl = adaptive_ttl and self.update_interval_s is not None
+        self._lookup_stats: Dict[str, List[int]] = {}
+        # Lookups are recorded from the router's worker threads; counts and TTLs change together.
+        self._stats_lock = threading.Lock()
         self.session = session
         if cache is None:
             from .cache import WeatherCache
 
             cache = WeatherCache.default()
         self.cache = cache
+        # Monotonic deadline set after a 429; cache misses are not fetched until it passes.
+        self._throttled_until = 0.0
+        # Fetches in progress per (scope, cache_key); concurrent misses wait on the same one.
+        self._inflight: Dict[tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
 
     def ttl_for(self, scope: str, fallback: Optional[int] = None) -> Optional[int]:
         if scope in self._ttl_scopes:
@@ -155,8 +304,37 @@ class Provider(ABC):
             return fallback
         return self._ttl_default
 
-    def supports_nowcast(self) -> bool:
-        return False
+    def _record_lookup(self, scope: str, hit: bool) -> None:
+        """Count a cache lookup and, once per window, adapt the scope's TTL to the miss rate."""
+        if not self._adaptive_ttl or scope not in self._ttl_scopes:
+            return
+        with self._stats_lock:
+            stats = self._lookup_stats.setdefault(scope, [0, 0])  # [lookups, misses]
+            stats[0] += 1
+            if not hit:
+                stats[1] += 1
+            if stats[0] < _TTL_WINDOW:
+                return
+            miss_rate = stats[1] / stats[0]
+            stats[0] = stats[1] = 0
+            if miss_rate > _TTL_GROW_ABOVE_MISS_RATE:
+                ttl = self._ttl_scopes[scope] * _TTL_GROW_FACTOR
+            elif miss_rate < _TTL_SHRINK_BELOW_MISS_RATE:
+                ttl = self._ttl_scopes[scope] * _TTL_SHRINK_FACTOR
+            else:
+                return
+            interval = self.update_interval_s
+            self._ttl_scopes[scope] = int(min(max(ttl, interval / 2), interval * 2))
+
+    def is_throttled(self) -> bool:
+        return time.monotonic() < self._throttled_until
+
+    def note_rate_limit(self, response: Any) -> None:
+        """Back off from the upstream API after a 429, for as long as its Retry-After asks."""
+        if response is None or getattr(response, "status_code", None) != 429:
+            return
+        wait = retry_after_seconds(response.headers.get("Retry-After"))
+        self._throttled_until = time.monotonic() + (RETRY_AFTER_MAX if wait is None else wait)
 
     def fetch_with_cache(
         self,
@@ -164,18 +342,99 @@ class Provider(ABC):
         key: Dict[str, Any],
         fetcher: Callable[[], pd.DataFrame],
         ttl: Optional[int] = None,
+        stale_ttl: float = 0.0,
     ) -> pd.DataFrame:
+        """Return cached data for ``key``, fetching on a miss.
+
+        Entries up to ``stale_ttl`` seconds past their TTL are served immediately while a
+        background thread refreshes them (stale-while-revalidate); older ones are refetched.
+        """
         cache_key = json.dumps(key, sort_keys=True)
         ttl_seconds = ttl if ttl is not None else self.ttl_for(scope)
         if ttl_seconds:
-            cached = self.cache.get(self.name, scope, cache_key)
-            if cached is not None:
+            hit = self.cache.lookup(self.name, scope, cache_key, max_stale=stale_ttl)
+            self._record_lookup(scope, hit is not None)
+            if hit is not None:
+                cached, stale = hit
+                if stale:
+                    self._revalidate(scope, cache_key, fetcher, ttl_seconds)
                 return cached
-        data = fetcher()
-        if ttl_seconds and not data.empty:
-            self.cache.set(self.name, scope, cache_key, data, ttl_seconds)
+        if self.is_throttled():
+            return pd.DataFrame(index=pd.DatetimeIndex([], tz="UTC"), columns=list(REQUIRED_COLUMNS), dtype=float)
+        return self._fetch_shared(scope, cache_key, fetcher, ttl_seconds)
+
+    def _fetch_shared(
+        self,
+        scope: str,
+        cache_key: str,
+        fetcher: Callable[[], pd.DataFrame],
+        ttl_seconds: Optional[int],
+    ) -> pd.DataFrame:
+        """Run ``fetcher`` once for concurrent callers of the same key and cache its result.
+
+        Every caller gets its own frame: the leader keeps the fetched one, followers copy a
+        private snapshot, so mutating a result never leaks into another caller's.
+        """
+        token = (scope, cache_key)
+        with self._inflight_lock:
+            future = self._inflight.get(token)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[token] = future
+        if not leader:
+            return future.result().copy()
+        try:
+            data = fetcher()
+            if ttl_seconds and not data.empty:
+                self.cache.set(self.name, scope, cache_key, data, ttl_seconds)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(data.copy())
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(token, None)
         return data
 
+    def _revalidate(
+        self,
+        scope: str,
+        cache_key: str,
+        fetcher: Callable[[], pd.DataFrame],
+        ttl_seconds: int,
+    ) -> None:
+        """Refresh a stale entry in the background unless a fetch for it is already running."""
+        with self._inflight_lock:
+            if (scope, cache_key) in self._inflight or self.is_throttled():
+                return
+
+        def _run() -> None:
+            try:
+                self._fetch_shared(scope, cache_key, fetcher, ttl_seconds)
+            except Exception as exc:  # pragma: no cover - network errors handled at runtime
+                logger.warning("Background refresh failed for provider %s (%s): %s", self.name, scope, exc)
+
+        threading.Thread(target=_run, name=f"{self.name}-revalidate", daemon=True).start()
+
+    def has_cached(self, scope: str, key: Dict[str, Any]) -> bool:
+        """Whether an unexpired entry for ``key`` is cached."""
+        return self.cache.lookup(self.name, scope, json.dumps(key, sort_keys=True)) is not None
+
+    def store(self, scope: str, key: Dict[str, Any], data: pd.DataFrame, ttl: Optional[int] = None) -> None:
+        """Cache ``data`` under ``key`` as if :meth:`fetch_with_cache` had fetched it."""
+        ttl_seconds = ttl if ttl is not None else self.ttl_for(scope)
+        if ttl_seconds and not data.empty:
+            self.cache.set(self.name, scope, json.dumps(key, sort_keys=True), data, ttl_seconds)
+
+    def prefetch(self, start: datetime, end: datetime, next_hours: int = 2) -> None:
+        """Warm the hourly and nowcast caches ahead of a cycle that reads both.
+
+        Providers that can serve both scopes from one upstream request override this;
+        the default leaves each scope to be fetched on demand.
+        """
+
     @abstractmethod
     def get_hourly(self, start: datetime, end: datetime) -> ForecastFrame:
         """Return hourly forecast between UTC boundaries."""
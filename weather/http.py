@@ -0,0 +1,152 @@
+"""HTTP helpers shared by the weather providers."""
+from __future__ import annotations
+
+import json
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import takewhile
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 8
+SHARED_POOL_CONNECTIONS = 32
+SHARED_POOL_MAXSIZE = 64
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BACKOFF = 1.0
+DEFAULT_BACKOFF_CAP = 30.0
+# Upper bound for honouring a server's Retry-After hint, in seconds.
+RETRY_AFTER_MAX = 60.0
+# Transient statuses worth retrying; auth and other client errors surface immediately.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """urllib3 retry with full-jitter exponential backoff.
+
+    The n-th consecutive retry sleeps ``uniform(0, min(backoff_max, backoff_factor * 2**(n-1)))``
+    so providers polling in lockstep do not retry in lockstep. urllib3 still prefers a
+    ``Retry-After`` header (seconds or HTTP-date) over this value.
+    """
+
+    def get_backoff_time(self) -> float:
+        consecutive_errors = sum(1 for _ in takewhile(lambda x: x.redirect_location is None, reversed(self.history)))
+        if consecutive_errors == 0:
+            return 0.0
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** (consecutive_errors - 1)))
+        return random.random() * ceiling
+
+
+def make_retry(
+    attempts: int = DEFAULT_ATTEMPTS,
+    backoff: float = DEFAULT_BACKOFF,
+    cap: float = DEFAULT_BACKOFF_CAP,
+) -> Retry:
+    """Retry policy allowing ``attempts`` tries in total with jittered exponential backoff.
+
+    Connection errors and :data:`RETRY_STATUSES` are retried inside urllib3, honouring
+    ``Retry-After``. The last response is returned rather than raised, so callers still
+    see an ``HTTPError`` from ``raise_for_status``.
+    """
+    return JitteredRetry(
+        total=max(attempts - 1, 0),
+        backoff_factor=backoff,
+        backoff_max=cap,
+        retry_after_max=RETRY_AFTER_MAX,
+        status_forcelist=RETRY_STATUSES,
+        # Tomorrow.io queries are read-only POSTs.
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def make_session(
+    *,
+    attempts: int = DEFAULT_ATTEMPTS,
+    backoff: float = DEFAULT_BACKOFF,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    """Return a keep-alive session with a pooled, retrying adapter for provider APIs.
+
+    Compression is negotiated by requests' default ``Accept-Encoding`` header.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=make_retry(attempts, backoff),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """Process-wide session so every provider reuses the same keep-alive pools."""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = make_session(
+                    pool_connections=SHARED_POOL_CONNECTIONS,
+                    pool_maxsize=SHARED_POOL_MAXSIZE,
+                )
+    return _shared_session
+
+
+def provider_session(attempts: int, backoff: float) -> requests.Session:
+    """Shared session for the default retry policy, a dedicated one for any other."""
+    if attempts == DEFAULT_ATTEMPTS and backoff == DEFAULT_BACKOFF:
+        return get_shared_session()
+    return make_session(attempts=attempts, backoff=backoff)
+
+
+def response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson's C parser when it is installed."""
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+def retry_after_seconds(value: Optional[str], *, cap: float = RETRY_AFTER_MAX) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header (integer or HTTP-date), clamped to ``cap``.
+
+    Returns ``None`` when the header is absent or unparseable.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), cap)
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Encode a request body as UTF-8 JSON, using orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(payload).encode("utf-8")
+    return orjson.dumps(payload)
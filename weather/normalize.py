@@ -2,30 +2,100 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
-from .core import REQUIRED_COLUMNS, ensure_schema
-
-
-def _build_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
-    if not rows:
+from .core import REQUIRED_COLUMNS, REQUIRED_COLUMNS_INDEX, ensure_schema
+
+
+OPENMETEO_TIME_FORMAT = "%Y-%m-%dT%H:%M"
+_INV_3_6 = 1.0 / 3.6
+_EPOCH_MIN_S = pd.Timestamp.min.timestamp()
+_EPOCH_MAX_S = pd.Timestamp.max.timestamp()
+OPENMETEO_FIELDS: Dict[str, str] = {
+    "temp_C": "temperature_2m",
+    "wind_ms": "windspeed_10m",
+    "wind_deg": "winddirection_10m",
+    "clouds_pct": "cloudcover",
+    "humidity": "relativehumidity_2m",
+    "uvi": "uv_index",
+    "ghi_Wm2": "shortwave_radiation",
+}
+OPENWEATHER_ONECALL_FIELDS: Dict[str, str] = {
+    "temp_C": "temp",
+    "wind_ms": "wind_speed",
+    "wind_deg": "wind_deg",
+    "clouds_pct": "clouds",
+    "humidity": "humidity",
+    "uvi": "uvi",
+}
+TOMORROW_FIELDS: Dict[str, str] = {
+    "temp_C": "temperature",
+    "wind_ms": "windSpeed",
+    "wind_deg": "windDirection",
+    "clouds_pct": "cloudCover",
+    "humidity": "humidity",
+    "uvi": "uvIndex",
+    "ghi_Wm2": "solarGHI",
+}
+
+
+def _parse_timestamps(values: Sequence[Any], fmt: Optional[str] = None) -> pd.DatetimeIndex:
+    """Parse timestamps in one batch; unparseable entries become NaT.
+
+    ``fmt`` selects pandas' exact-format fast path; any miss re-parses as generic ISO 8601.
+    """
+    values = list(values)
+    if fmt is not None:
+        parsed = pd.DatetimeIndex(pd.to_datetime(values, utc=True, errors="coerce", format=fmt))
+        if not parsed.isna().any():
+            return parsed
+    return pd.DatetimeIndex(pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601"))
+
+
+def _epoch_index(seconds: np.ndarray) -> pd.DatetimeIndex:
+    """UTC index from Unix seconds; NaN or out-of-range epochs become NaT."""
+    seconds = np.where((seconds >= _EPOCH_MIN_S) & (seconds <= _EPOCH_MAX_S), seconds, np.nan)
+    return pd.DatetimeIndex(pd.to_datetime(seconds, unit="s", utc=True, errors="coerce")).as_unit("us")
+
+
+def _build_frame(columns: Dict[str, Any], index: Any) -> pd.DataFrame:
+    """Assemble a schema-conformant frame from per-column values and their timestamps.
+
+    NaT timestamps are dropped together with their values.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.size == 0:
         return pd.DataFrame(
             index=pd.DatetimeIndex([], tz="UTC"),
             columns=REQUIRED_COLUMNS,
             dtype=float,
         )
-    frame = pd.DataFrame(rows)
-    if "timestamp" not in frame.columns:
-        raise ValueError("Normalized rows must include 'timestamp'")
-    frame = frame.set_index("timestamp")
-    frame.index = pd.to_datetime(frame.index, utc=True)
-    frame = frame.sort_index()
+    if set(columns) <= set(REQUIRED_COLUMNS):
+        # Lay columns out in schema order up front so the common case needs no reindex.
+        missing = np.full(index.size, np.nan)
+        columns = {column: columns.get(column, missing) for column in REQUIRED_COLUMNS}
+    frame = pd.DataFrame(columns, index=index)
+    if index.hasnans:
+        frame = frame.loc[index.notna()]
+    if _is_schema_compliant(frame):
+        return frame
     return ensure_schema(frame)
 
 
+def _is_schema_compliant(frame: pd.DataFrame) -> bool:
+    index = frame.index
+    return (
+        frame.columns.equals(REQUIRED_COLUMNS_INDEX)
+        and bool((frame.dtypes == np.float64).all())
+        and isinstance(index, pd.DatetimeIndex)
+        and str(index.tz) == "UTC"
+        and index.is_monotonic_increasing
+    )
+
+
 def kelvin_to_celsius(value: Optional[float]) -> Optional[float]:
     if value is None:
         return None
@@ -38,6 +108,13 @@ def kmh_to_ms(value: Optional[float]) -> Optional[float]:
     return float(value) / 3.6
 
 
+def kmh_to_ms_arr(values: Any) -> np.ndarray:
+    """Convert in place when ``values`` is already a float64 ndarray."""
+    array = np.asarray(values, dtype=np.float64)
+    array *= _INV_3_6
+    return array
+
+
 def normalize_openweather(payload: Dict[str, Any], *, mode: str = "onecall") -> pd.DataFrame:
     """Normalize OpenWeather responses for both One Call and forecast APIs."""
     if mode == "forecast":
@@ -48,235 +125,179 @@ def normalize_openweather(payload: Dict[str, Any], *, mode: str = "onecall") ->
 def normalize_openweather_onecall(payload: Dict[str, Any]) -> pd.DataFrame:
     # Validate payload structure
     if not payload or not isinstance(payload, dict):
-        return _build_frame([])
-
-    rows: List[Dict[str, Any]] = []
-
-    def _extract(entry: Dict[str, Any]) -> None:
-        if not entry:
-            return
-        timestamp = entry.get("dt")
-        if timestamp is None:
-            return
-        try:
-            dt = pd.Timestamp.fromtimestamp(timestamp, tz="UTC")
-        except (ValueError, OSError, OverflowError):
-            return
-        rows.append(
-            {
-                "timestamp": dt,
-                "temp_C": entry.get("temp"),
-                "wind_ms": entry.get("wind_speed"),
-                "wind_deg": entry.get("wind_deg"),
-                "clouds_pct": entry.get("clouds"),
-                "humidity": entry.get("humidity"),
-                "uvi": entry.get("uvi"),
-                "ghi_Wm2": np.nan,
-            }
-        )
+        return _build_frame({}, [])
 
+    entries: List[Dict[str, Any]] = []
     current = payload.get("current")
     if current:
-        _extract(current)
+        entries.append(current)
     hourly_data = payload.get("hourly")
     if hourly_data and isinstance(hourly_data, list):
-        for entry in hourly_data:
-            _extract(entry)
+        entries.extend(entry for entry in hourly_data if entry)
+    entries = [entry for entry in entries if entry.get("dt") is not None]
 
-    frame = _build_frame(rows)
-    if not frame.empty:
-        frame["temp_C"] = frame["temp_C"].apply(lambda v: float(v) if v is not None else np.nan)
-        frame["wind_ms"] = frame["wind_ms"].apply(lambda v: float(v) if v is not None else np.nan)
-    return frame
+    stamps = _epoch_index(_float_column(entry["dt"] for entry in entries))
+    columns = {
+        column: _float_column(entry.get(key) for entry in entries)
+        for column, key in OPENWEATHER_ONECALL_FIELDS.items()
+    }
+    return _build_frame(columns, stamps)
 
 
 def normalize_openweather_forecast(payload: Dict[str, Any]) -> pd.DataFrame:
     """Normalize OpenWeather free-plan forecast (3-hour) and current weather data."""
     if not payload or not isinstance(payload, dict):
-        return _build_frame([])
+        return _build_frame({}, [])
 
     forecast = payload.get("forecast") or {}
     current = payload.get("current") or {}
-    rows: List[Dict[str, Any]] = []
-
-    def _append_entry(dt_seconds: int, data: Dict[str, Any], *, main_key: str = "main") -> None:
-        try:
-            dt = pd.Timestamp.fromtimestamp(dt_seconds, tz="UTC")
-        except (ValueError, OSError, OverflowError):
-            return
-        main_block = data.get(main_key, data)
-        wind = data.get("wind", {})
-        clouds = data.get("clouds", {})
-        rows.append(
-            {
-                "timestamp": dt,
-                "temp_C": _safe_float(main_block.get("temp")),
-                "wind_ms": _safe_float(wind.get("speed")),
-                "wind_deg": _safe_float(wind.get("deg")),
-                "clouds_pct": _safe_float(clouds.get("all")),
-                "humidity": _safe_float(main_block.get("humidity")),
-                "uvi": np.nan,
-                "ghi_Wm2": np.nan,
-            }
-        )
-
-    if isinstance(current, dict) and "dt" in current:
-        _append_entry(int(current["dt"]), current)
-
     forecast_list = forecast.get("list")
+    entries: List[Dict[str, Any]] = []
     if isinstance(forecast_list, list):
-        for item in forecast_list:
-            if not isinstance(item, dict):
-                continue
-            dt_val = item.get("dt")
-            if dt_val is None:
-                continue
-            _append_entry(int(dt_val), item)
-
-    frame = _build_frame(rows)
+        entries = [item for item in forecast_list if isinstance(item, dict) and item.get("dt") is not None]
+    # Epochs are whole seconds; truncate like int() would for fractional values.
+    seconds = np.trunc(_float_column(entry["dt"] for entry in entries))
+
+    if isinstance(current, dict) and current.get("dt") is not None:
+        # Splice the single current reading into the ordered forecast instead of re-sorting;
+        # side="left" keeps it ahead of an equal forecast slot, which then wins the de-duplication.
+        current_s = np.trunc(_float_or_nan(current["dt"]))
+        position = int(np.searchsorted(seconds, current_s, side="left"))
+        seconds = np.insert(seconds, position, current_s)
+        entries.insert(position, current)
+
+    stamps = _epoch_index(seconds)
     # Remove duplicate timestamps keeping latest (forecast overrides current)
-    if not frame.empty:
-        frame = frame[~frame.index.duplicated(keep="last")]
-    return frame
+    keep = ~stamps.duplicated(keep="last")
+    mains = [entry.get("main", entry) for entry in entries]
+    winds = [entry.get("wind", {}) for entry in entries]
+    columns = {
+        "temp_C": _float_column(main.get("temp") for main in mains)[keep],
+        "wind_ms": _float_column(wind.get("speed") for wind in winds)[keep],
+        "wind_deg": _float_column(wind.get("deg") for wind in winds)[keep],
+        "clouds_pct": _float_column(entry.get("clouds", {}).get("all") for entry in entries)[keep],
+        "humidity": _float_column(main.get("humidity") for main in mains)[keep],
+    }
+    return _build_frame(columns, stamps[keep])
 
 
 def normalize_openmeteo(payload: Dict[str, Any]) -> pd.DataFrame:
     # Validate payload structure
     if not payload or not isinstance(payload, dict):
-        return _build_frame([])
+        return _build_frame({}, [])
 
     hourly = payload.get("hourly")
     if not hourly or not isinstance(hourly, dict):
-        return _build_frame([])
+        return _build_frame({}, [])
 
     timestamps = hourly.get("time")
     if not timestamps or not isinstance(timestamps, (list, tuple)):
-        return _build_frame([])
+        return _build_frame({}, [])
 
-    rows = []
+    n = len(timestamps)
+    index = _parse_timestamps(timestamps, fmt=OPENMETEO_TIME_FORMAT)
     hourly_units = payload.get("hourly_units", {})
     wind_units = hourly_units.get("windspeed_10m") if isinstance(hourly_units, dict) else None
 
-    for idx, ts in enumerate(timestamps):
-        try:
-            dt = pd.to_datetime(ts, utc=True)
-        except (ValueError, TypeError):
-            # Skip invalid timestamps
-            continue
-        rows.append(
-            {
-                "timestamp": dt,
-                "temp_C": _at(hourly, "temperature_2m", idx),
-                "wind_ms": _convert_windspeed(hourly, wind_units, idx),
-                "wind_deg": _at(hourly, "winddirection_10m", idx),
-                "clouds_pct": _at(hourly, "cloudcover", idx),
-                "humidity": _at(hourly, "relativehumidity_2m", idx),
-                "uvi": _at(hourly, "uv_index", idx),
-                "ghi_Wm2": _at(hourly, "shortwave_radiation", idx),
-            }
-        )
-    frame = _build_frame(rows)
-    return frame
-
-
-def _at(mapping: Dict[str, Iterable[Any]], key: str, index: int) -> Optional[float]:
-    """Get value from mapping with fallback to model-suffixed keys."""
-    # Try exact key first
-    values = mapping.get(key)
-    if values:
-        try:
-            value = values[index]
-            if value is not None:
-                return float(value)
-        except (IndexError, TypeError, ValueError):
-            pass
-
-    # If not found or value is None, try keys with model suffixes
-    # (e.g., temperature_2m_ecmwf_ifs04, temperature_2m_icon_seamless)
-    for map_key in sorted(mapping.keys()):  # Sort for deterministic order
-        if map_key.startswith(key + "_"):
-            candidate_values = mapping.get(map_key)
-            if candidate_values:
-                try:
-                    candidate_value = candidate_values[index]
-                    if candidate_value is not None:
-                        return float(candidate_value)
-                except (IndexError, TypeError, ValueError):
-                    continue  # Try next model
-
-    return None
-
-
-def _convert_windspeed(hourly: Dict[str, Iterable[Any]], units: Optional[str], idx: int) -> Optional[float]:
-    value = _at(hourly, "windspeed_10m", idx)
-    if value is None:
-        return None
-    if not units:
-        # fall back to API metadata if available
+    resolver = _resolve_model_keys(hourly, OPENMETEO_FIELDS.values())
+    columns = {column: _column(hourly, resolver[key], n) for column, key in OPENMETEO_FIELDS.items()}
+    if wind_units and any(token in str(wind_units).lower() for token in ("km/h", "kph")):
+        columns["wind_ms"] = kmh_to_ms_arr(columns["wind_ms"])
+    # Rows with invalid timestamps are dropped by _build_frame.
+    return _build_frame(columns, index)
+
+
+def _coerce_floats(values: Sequence[Any]) -> np.ndarray:
+    """float64 array from JSON values; None/unparseable become NaN.
+
+    numpy's C-level cast (which already maps None to NaN) handles clean payloads;
+    the per-value Python path runs only when that cast rejects something.
+    """
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        array = None
+    if array is None or array.ndim != 1:
+        array = np.fromiter((_float_or_nan(value) for value in values), dtype=np.float64, count=len(values))
+    return array
+
+
+def _float_array(values: Sequence[Any], n: int) -> np.ndarray:
+    """Coerce the first ``n`` JSON values to float64, padding short lists with NaN."""
+    out = np.full(n, np.nan)
+    m = min(n, len(values))
+    if m:
+        out[:m] = _coerce_floats(values[:m])
+    return out
+
+
+def _float_or_nan(value: Any) -> float:
+    try:
         return float(value)
-    units = str(units).lower()
-    if "km/h" in units or "kph" in units:
-        return kmh_to_ms(value)
-    return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float_column(values: Iterable[Any]) -> np.ndarray:
+    """float64 column from JSON values gathered in one pass."""
+    return _coerce_floats(list(values))
+
+
+def _resolve_model_keys(mapping: Dict[str, Any], base_keys: Iterable[str]) -> Dict[str, List[str]]:
+    """Map each base key to its lookup order: the exact key, then model-suffixed variants.
+
+    Suffixed variants (e.g. temperature_2m_ecmwf_ifs04, temperature_2m_icon_seamless)
+    follow in sorted order; the payload keys are scanned once for all bases.
+    """
+    resolver: Dict[str, List[str]] = {key: [key] for key in base_keys}
+    for name in sorted(mapping.keys()):
+        for key, candidates in resolver.items():
+            if name.startswith(key + "_"):
+                candidates.append(name)
+    return resolver
+
+
+def _column(mapping: Dict[str, Sequence[Any]], candidates: Sequence[str], n: int) -> np.ndarray:
+    """Column taking each value from the first candidate key that provides it."""
+    out = np.full(n, np.nan)
+    for name in candidates:
+        values = mapping.get(name)
+        if not values:
+            continue
+        missing = np.isnan(out)
+        out[missing] = _float_array(values, n)[missing]
+        if not np.isnan(out).any():
+            break
+    return out
 
 
 def normalize_tomorrow(payload: Dict[str, Any]) -> pd.DataFrame:
     # Validate payload structure
     if not payload or not isinstance(payload, dict):
-        return _build_frame([])
+        return _build_frame({}, [])
 
     data = payload.get("data")
     if not data or not isinstance(data, dict):
-        return _build_frame([])
+        return _build_frame({}, [])
 
     timelines = data.get("timelines")
     if not timelines or not isinstance(timelines, list):
-        return _build_frame([])
+        return _build_frame({}, [])
 
-    rows: List[Dict[str, Any]] = []
-    for timeline in timelines:
-        if not isinstance(timeline, dict):
-            continue
-        intervals = timeline.get("intervals")
-        if not intervals or not isinstance(intervals, list):
-            continue
-        for interval in intervals:
-            if not isinstance(interval, dict):
-                continue
-            timestamp = interval.get("startTime")
-            if timestamp is None:
-                continue
-            try:
-                dt = pd.to_datetime(timestamp, utc=True)
-            except (ValueError, TypeError):
-                # Skip invalid timestamps
-                continue
-            values = interval.get("values")
-            if not isinstance(values, dict):
-                values = {}
-            rows.append(
-                {
-                    "timestamp": dt,
-                    "temp_C": _safe_float(values.get("temperature")),
-                    "wind_ms": _safe_float(values.get("windSpeed")),
-                    "wind_deg": _safe_float(values.get("windDirection")),
-                    "clouds_pct": _safe_float(values.get("cloudCover")),
-                    "humidity": _safe_float(values.get("humidity")),
-                    "uvi": _safe_float(values.get("uvIndex")),
-                    "ghi_Wm2": _safe_float(values.get("solarGHI")),
-                }
-            )
-    return _build_frame(rows)
-
-
-def _safe_float(value: Any) -> Optional[float]:
-    if value is None or (isinstance(value, float) and np.isnan(value)):
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+    intervals = [
+        interval
+        for timeline in timelines
+        if isinstance(timeline, dict) and isinstance(timeline.get("intervals"), list)
+        for interval in timeline["intervals"]
+        if isinstance(interval, dict) and interval.get("startTime") is not None
+    ]
+    stamps = _parse_timestamps([interval["startTime"] for interval in intervals])
+
+    values = [interval["values"] if isinstance(interval.get("values"), dict) else {} for interval in intervals]
+    columns = {column: _float_column(item.get(key) for item in values) for column, key in TOMORROW_FIELDS.items()}
+    # Intervals with invalid timestamps are dropped by _build_frame.
+    return _build_frame(columns, stamps)
 
 
 def empty_frame() -> pd.DataFrame:
-    return _build_frame([])
+    return _build_frame({}, [])
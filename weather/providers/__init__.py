@@ -1,10 +1,24 @@
 """Provider implementations for the weather package."""
-from .openmeteo_ecmwf import OpenMeteoECMWFProvider
-from .openweather import OpenWeatherProvider
-from .tomorrow_io import TomorrowIOProvider
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_MODULES = {
+    "OpenMeteoECMWFProvider": "openmeteo_ecmwf",
+    "OpenWeatherProvider": "openweather",
+    "TomorrowIOProvider": "tomorrow_io",
+}
 
 __all__ = [
     "OpenMeteoECMWFProvider",
     "OpenWeatherProvider",
     "TomorrowIOProvider",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Provider modules are imported on first use so configuring one does not load the others.
+    if name in _MODULES:
+        return getattr(import_module(f".{_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module 'weather.providers' has no attribute '{name}'")
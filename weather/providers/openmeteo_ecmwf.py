@@ -2,15 +2,15 @@
 from __future__ import annotations
 
 import logging
-import time
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
 import pandas as pd
 import requests
 
-from ..core import ForecastFrame, Provider, ensure_schema, resample_frame
-from ..normalize import normalize_openmeteo
+from ..core import ForecastFrame, Provider, as_utc_timestamp, ensure_schema, resample_frame, slice_window
+from ..http import provider_session, response_json
+from ..normalize import OPENMETEO_FIELDS, empty_frame, normalize_openmeteo
 
 MODEL_ALIASES = {
     "ecmwf": "ecmwf_ifs04",
@@ -26,9 +26,15 @@ MODEL_ALIASES = {
 
 logger = logging.getLogger(__name__)
 
+# Nowcasts include the hour before "now" so interpolation has a left anchor.
+_NOWCAST_LOOKBACK = pd.Timedelta(hours=1)
+_HOURLY_PARAM = ",".join(OPENMETEO_FIELDS.values())
+
 
 class OpenMeteoECMWFProvider(Provider):
     API_ENDPOINT = "https://api.open-meteo.com/v1/forecast"
+    supports_nowcast = True
+    update_interval_s = 3600
 
     def __init__(
         self,
@@ -36,7 +42,7 @@ class OpenMeteoECMWFProvider(Provider):
         latitude: float,
         longitude: float,
         models: Optional[Iterable[str]] = None,
-        ttl: int = 1800,
+        ttl: Optional[int] = None,
         priority: int = 120,
         cache=None,
         session: Optional[requests.Session] = None,
@@ -44,6 +50,8 @@ class OpenMeteoECMWFProvider(Provider):
         backoff: float = 1.0,
         timezone: str = "UTC",
     ) -> None:
+        adaptive_ttl = ttl is None
+        ttl = self.update_interval_s if ttl is None else ttl
         super().__init__(
             "openmeteo_ecmwf",
             priority=priority,
@@ -51,34 +59,45 @@ class OpenMeteoECMWFProvider(Provider):
             ttl=ttl,
             ttl_scopes={"hourly": ttl},
             session=session,
+            adaptive_ttl=adaptive_ttl,
         )
         self.latitude = latitude
         self.longitude = longitude
         self.models = self._normalize_models(models)
-        self.session = session or requests.Session()
+        # retries/backoff only shape the default session; an injected session is used as-is,
+        # so it retries only if the caller mounted a retrying adapter (see weather.http.make_session).
+        self.session = session or provider_session(retries, backoff)
         self.retries = retries
         self.backoff = backoff
         self.timezone = timezone
+        # Query parameters depend only on construction arguments, so build them once.
+        self._params: Dict[str, Any] = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": _HOURLY_PARAM,
+            "timezone": timezone,
+        }
+        if self.models:
+            self._params["models"] = ",".join(self.models)
 
     def get_hourly(self, start: datetime, end: datetime) -> ForecastFrame:
-        start_ts = self._as_utc_timestamp(start)
-        end_ts = self._as_utc_timestamp(end)
+        start_ts = as_utc_timestamp(start)
+        end_ts = as_utc_timestamp(end)
 
+        # The request does not depend on the window, so cache the whole forecast and slice afterwards.
         def _fetch() -> pd.DataFrame:
-            payload = self._request()
-            frame = normalize_openmeteo(payload)
-            mask = (frame.index >= start_ts) & (frame.index <= end_ts)
-            return frame.loc[mask]
+            return normalize_openmeteo(self._request())
 
+        ttl = self.ttl_for("hourly", fallback=3600)
         frame = self.fetch_with_cache(
             "hourly",
             {"lat": self.latitude, "lon": self.longitude, "models": self.models},
             _fetch,
-            ttl=self.ttl_for("hourly", fallback=3600),
+            ttl=ttl,
+            stale_ttl=ttl,
         )
         frame = ensure_schema(frame)
-        mask = (frame.index >= start_ts) & (frame.index <= end_ts)
-        filtered = frame.loc[mask]
+        filtered = slice_window(frame, start_ts, end_ts)
         return ForecastFrame(
             filtered,
             {
@@ -89,21 +108,20 @@ class OpenMeteoECMWFProvider(Provider):
             },
         )
 
-    def supports_nowcast(self) -> bool:
-        return True
-
     def get_nowcast(self, next_hours: int = 2) -> ForecastFrame:
         now_utc = pd.Timestamp.now(tz="UTC")
         horizon = now_utc + pd.Timedelta(hours=next_hours)
+        if self.is_throttled():
+            return ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
 
         payload = self._request()
         frame = normalize_openmeteo(payload)
         if frame.empty:
             return ForecastFrame(frame, {"source": self.name})
 
-        window = frame.loc[(frame.index >= now_utc - pd.Timedelta(hours=1)) & (frame.index <= horizon)]
+        window = slice_window(frame, now_utc - _NOWCAST_LOOKBACK, horizon)
         resampled = resample_frame(window, "15min", method="interpolate")
-        resampled = resampled.loc[resampled.index <= horizon]
+        resampled = slice_window(resampled, end=horizon)
         return ForecastFrame(resampled, {"source": self.name})
 
     def _normalize_models(self, models: Optional[Iterable[str]]) -> List[str]:
@@ -126,44 +144,17 @@ class OpenMeteoECMWFProvider(Provider):
         return normalized
 
     def _request(self) -> Dict[str, Any]:
-        params = {
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "hourly": ",".join(
-                [
-                    "temperature_2m",
-                    "windspeed_10m",
-                    "winddirection_10m",
-                    "cloudcover",
-                    "relativehumidity_2m",
-                    "uv_index",
-                    "shortwave_radiation",
-                ]
-            ),
-            "timezone": self.timezone,
-        }
-        if self.models:
-            params["models"] = ",".join(self.models)
-
-        last_exc: Optional[Exception] = None
-        for attempt in range(1, self.retries + 1):
-            try:
-                response = self.session.get(self.API_ENDPOINT, params=params, timeout=10)
-                response.raise_for_status()
-                json_data = response.json()
-                # Validate that response contains expected structure
-                if not isinstance(json_data, dict):
-                    raise ValueError("API response is not a valid JSON object")
-                return json_data
-            except Exception as exc:  # pragma: no cover - network failure
-                last_exc = exc
-                time.sleep(self.backoff * attempt)
-                continue
-        raise RuntimeError(f"Open-Meteo request failed after {self.retries} attempts: {last_exc}")
-
-    @staticmethod
-    def _as_utc_timestamp(value: datetime | pd.Timestamp) -> pd.Timestamp:
-        ts = pd.Timestamp(value)
-        if ts.tz is None:
-            return ts.tz_localize("UTC")
-        return ts.tz_convert("UTC")
+        # Transient failures are retried by the session adapter (see weather.http.make_retry).
+        try:
+            response = self.session.get(self.API_ENDPOINT, params=self._params, timeout=10)
+            response.raise_for_status()
+            json_data = response_json(response)
+        except requests.HTTPError as exc:
+            self.note_rate_limit(exc.response)
+            raise RuntimeError(f"Open-Meteo request failed: {exc}") from exc
+        except Exception as exc:  # pragma: no cover - network failure
+            raise RuntimeError(f"Open-Meteo request failed: {exc}") from exc
+        # Validate that response contains expected structure
+        if not isinstance(json_data, dict):
+            raise RuntimeError("Open-Meteo response is not a valid JSON object")
+        return json_data
@@ -4,18 +4,25 @@ from __future__ import annotations
 import logging
 import os
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
-from ..core import ForecastFrame, Provider, ensure_schema, resample_frame
+from ..core import ForecastFrame, Provider, as_utc_timestamp, ensure_schema, resample_frame, slice_window
+from ..http import provider_session, response_json
 from ..normalize import empty_frame, normalize_openweather
 
 logger = logging.getLogger(__name__)
 
+_CLIENT_ERROR_RE = re.compile(r"Client Error:\s*(.*)")
+_STATUS_RE = re.compile(r"(\d{3})\s+[A-Za-z]+ Error")
+_DETAIL_MAX_BYTES = 512
+# Reused across calls so forecast-mode refreshes do not spawn threads each time.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ow-fetch")
+
 
 class OpenWeatherAuthError(RuntimeError):
     """Raised when OpenWeather rejects the API key."""
@@ -32,6 +39,7 @@ class OpenWeatherProvider(Provider):
     API_ENDPOINT_V25 = "https://api.openweathermap.org/data/2.5/onecall"
     API_ENDPOINT_FORECAST = "https://api.openweathermap.org/data/2.5/forecast"
     API_ENDPOINT_CURRENT = "https://api.openweathermap.org/data/2.5/weather"
+    update_interval_s = 600
 
     def __init__(
         self,
@@ -40,7 +48,7 @@ class OpenWeatherProvider(Provider):
         longitude: float,
         api_key: Optional[str] = None,
         units: str = "metric",
-        ttl: int = 1800,
+        ttl: Optional[int] = None,
         priority: int = 100,
         cache=None,
         session: Optional[requests.Session] = None,
@@ -50,6 +58,8 @@ class OpenWeatherProvider(Provider):
         skip_on_auth_failure: bool = True,
         api_mode: str = "auto",  # auto | onecall | forecast
     ) -> None:
+        adaptive_ttl = ttl is None
+        ttl = self.update_interval_s if ttl is None else ttl
         super().__init__(
             "openweather",
             priority=priority,
@@ -57,28 +67,43 @@ class OpenWeatherProvider(Provider):
             ttl=ttl,
             ttl_scopes={"hourly": ttl},
             session=session,
+            adaptive_ttl=adaptive_ttl,
         )
         self.latitude = latitude
         self.longitude = longitude
         self.units = units
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
-        self.session = session or requests.Session()
+        # retries/backoff only shape the default session; an injected session is used as-is,
+        # so it retries only if the caller mounted a retrying adapter (see weather.http.make_session).
+        self.session = session or provider_session(retries, backoff)
         self.base_url = base_url or self.API_ENDPOINT
         self.retries = retries
         self.backoff = backoff
         self.skip_on_auth_failure = skip_on_auth_failure
         self._auth_failure_logged = False
         self._permanently_disabled = False
+        # Returned on every call once the provider is disabled; built once instead of per tick.
+        self._skipped_result = ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
+        if not self.api_key:
+            logger.warning("OPENWEATHER_API_KEY is not configured; provider %s will be skipped", self.name)
         self.api_mode = api_mode.lower()
+        # Query parameters depend only on construction arguments, so build them once.
+        self._forecast_params: Dict[str, Any] = {
+            "lat": latitude,
+            "lon": longitude,
+            "appid": self.api_key,
+            "units": units,
+        }
+        self._onecall_params: Dict[str, Any] = {**self._forecast_params, "exclude": "minutely,daily,alerts"}
         self._force_forecast_only = self.api_mode == "forecast"
 
     def get_hourly(self, start: datetime, end: datetime) -> ForecastFrame:
-        # Skip provider if permanently disabled due to auth failure
-        if self._permanently_disabled:
-            return ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
+        # Skip provider without touching the cache if it is disabled or has no key
+        if self._permanently_disabled or not self.api_key:
+            return self._skipped_result
 
-        start_ts = self._as_utc_timestamp(start)
-        end_ts = self._as_utc_timestamp(end)
+        start_ts = as_utc_timestamp(start)
+        end_ts = as_utc_timestamp(end)
 
         def _fetch() -> pd.DataFrame:
             mode, payload = self._request()
@@ -92,19 +117,19 @@ class OpenWeatherProvider(Provider):
             if mode == "forecast":
                 # Forecast API provides 3-hour increments; resample to hourly for consistency.
                 frame = resample_frame(frame, "1h", method="interpolate")
+            # The request does not depend on the window, so cache the whole forecast and slice afterwards.
+            return frame
 
-            mask = (frame.index >= start_ts) & (frame.index <= end_ts)
-            return frame.loc[mask]
-
+        ttl = self.ttl_for("hourly", fallback=1800)
         frame = self.fetch_with_cache(
             "hourly",
             {"lat": self.latitude, "lon": self.longitude},
             _fetch,
-            ttl=self.ttl_for("hourly", fallback=1800),
+            ttl=ttl,
+            stale_ttl=ttl,
         )
         frame = ensure_schema(frame)
-        mask = (frame.index >= start_ts) & (frame.index <= end_ts)
-        filtered = frame.loc[mask]
+        filtered = slice_window(frame, start_ts, end_ts)
         metadata = {
             "source": self.name,
             "latitude": self.latitude,
@@ -142,18 +167,14 @@ class OpenWeatherProvider(Provider):
             self._force_forecast_only = True
             return "forecast", self._request_forecast()
         except Exception as exc:  # pragma: no cover - network or API failure
+            if self.is_throttled():
+                # Rate limited, not unsupported: keep One Call for when the throttle lifts.
+                raise
             logger.warning("OpenWeather One Call request failed (%s); using forecast API instead.", exc)
             self._force_forecast_only = True
             return "forecast", self._request_forecast()
 
     def _request_onecall(self) -> Dict[str, Any]:
-        params: Dict[str, Any] = {
-            "lat": self.latitude,
-            "lon": self.longitude,
-            "appid": self.api_key,
-            "units": self.units,
-            "exclude": "minutely,daily,alerts",
-        }
         primary_url = self.base_url or self.API_ENDPOINT
         endpoints = [primary_url]
         tried_urls: List[str] = []
@@ -163,25 +184,25 @@ class OpenWeatherProvider(Provider):
             auth_error: Optional[Tuple[int, str]] = None
             last_exc: Optional[Exception] = None
 
-            for attempt in range(1, self.retries + 1):
-                try:
-                    response = self.session.get(url, params=params, timeout=10)
-                    response.raise_for_status()
-                    json_data = response.json()
-                    # Validate that response contains expected structure
-                    if not isinstance(json_data, dict):
-                        raise ValueError("API response is not a valid JSON object")
-                    return json_data
-                except requests.HTTPError as exc:
-                    status = self._status_code(exc)
-                    detail = self._http_error_detail(exc)
-                    if status in (401, 403):
-                        auth_error = (status, detail)
-                        break
-                    last_exc = exc
-                except Exception as exc:  # pragma: no cover - network failure
+            # Transient failures are retried by the session adapter (see weather.http.make_retry).
+            try:
+                response = self.session.get(url, params=self._onecall_params, timeout=10)
+                response.raise_for_status()
+                json_data = response_json(response)
+                # Validate that response contains expected structure
+                if not isinstance(json_data, dict):
+                    raise ValueError("API response is not a valid JSON object")
+                return json_data
+            except requests.HTTPError as exc:
+                status = self._status_code(exc)
+                detail = self._http_error_detail(exc)
+                if status in (401, 403):
+                    auth_error = (status, detail)
+                else:
+                    self.note_rate_limit(exc.response)
                     last_exc = exc
-                time.sleep(self.backoff * attempt)
+            except Exception as exc:  # pragma: no cover - network failure
+                last_exc = exc
 
             if auth_error is not None:
                 status, detail = auth_error
@@ -203,22 +224,21 @@ class OpenWeatherProvider(Provider):
                         last_exc,
                     )
                     continue
-                raise RuntimeError(
-                    f"OpenWeather request failed after {self.retries} attempts for {url}: {last_exc}"
-                ) from last_exc
+                raise RuntimeError(f"OpenWeather request failed for {url}: {last_exc}") from last_exc
 
         raise RuntimeError(f"OpenWeather request failed for endpoints: {', '.join(tried_urls)}")
 
     def _request_forecast(self) -> Dict[str, Any]:
-        params = {
-            "lat": self.latitude,
-            "lon": self.longitude,
-            "appid": self.api_key,
-            "units": self.units,
-        }
         try:
-            forecast = self._request_with_retries(self.API_ENDPOINT_FORECAST, params)
-            current = self._request_with_retries(self.API_ENDPOINT_CURRENT, params)
+            # Independent round-trips: overlap them on the shared connection pool.
+            forecast_future = _FETCH_POOL.submit(self._get_json, self.API_ENDPOINT_FORECAST, self._forecast_params)
+            current_future = _FETCH_POOL.submit(self._get_json, self.API_ENDPOINT_CURRENT, self._forecast_params)
+            try:
+                forecast = forecast_future.result()
+                current = current_future.result()
+            except BaseException:
+                current_future.cancel()
+                raise
         except OpenWeatherAuthError:
             if self.skip_on_auth_failure:
                 if not self._auth_failure_logged:
@@ -232,29 +252,23 @@ class OpenWeatherProvider(Provider):
             raise
         return {"current": current, "forecast": forecast}
 
-    def _request_with_retries(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        last_exc: Optional[Exception] = None
-        for attempt in range(1, self.retries + 1):
-            try:
-                response = self.session.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, dict):
-                    raise ValueError(f"OpenWeather response from {url} is not a JSON object")
-                return data
-            except requests.HTTPError as exc:
-                status = self._status_code(exc)
-                detail = self._http_error_detail(exc)
-                if self.skip_on_auth_failure:
-                    if status in (401, 403):
-                        raise OpenWeatherAuthError(status, detail) from exc
-                last_exc = exc
-            except Exception as exc:  # pragma: no cover - network failure
-                last_exc = exc
-            time.sleep(self.backoff * attempt)
-        if last_exc:
-            raise RuntimeError(f"OpenWeather request failed after {self.retries} attempts for {url}: {last_exc}") from last_exc
-        raise RuntimeError(f"OpenWeather request failed for {url}")
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Transient failures are retried by the session adapter (see weather.http.make_retry).
+        try:
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response_json(response)
+        except requests.HTTPError as exc:
+            status = self._status_code(exc)
+            if self.skip_on_auth_failure and status in (401, 403):
+                raise OpenWeatherAuthError(status, self._http_error_detail(exc)) from exc
+            self.note_rate_limit(exc.response)
+            raise RuntimeError(f"OpenWeather request failed for {url}: {exc}") from exc
+        except Exception as exc:  # pragma: no cover - network failure
+            raise RuntimeError(f"OpenWeather request failed for {url}: {exc}") from exc
+        if not isinstance(data, dict):
+            raise RuntimeError(f"OpenWeather response from {url} is not a JSON object")
+        return data
 
     @staticmethod
     def _http_error_detail(exc: requests.HTTPError) -> str:
@@ -262,16 +276,17 @@ class OpenWeatherProvider(Provider):
         detail: Optional[str] = None
         if response is not None:
             try:
-                payload = response.json()
+                payload = response_json(response)
             except ValueError:
                 payload = None
             if isinstance(payload, dict):
                 detail = payload.get("message") or payload.get("msg") or payload.get("error")
             if not detail:
-                text = response.text.strip()
+                # Error pages can be large HTML documents; a short prefix is enough for the log.
+                text = response.content[:_DETAIL_MAX_BYTES].decode("utf-8", errors="replace").strip()
                 detail = text if text else None
         if not detail:
-            match = re.search(r"Client Error:\s*(.*)", str(exc))
+            match = _CLIENT_ERROR_RE.search(str(exc))
             if match:
                 extracted = match.group(1).strip()
                 if extracted:
@@ -288,17 +303,10 @@ class OpenWeatherProvider(Provider):
                     return int(raw)
                 except (TypeError, ValueError):
                     pass
-        match = re.search(r"(\d{3})\s+[A-Za-z]+ Error", str(exc))
+        match = _STATUS_RE.search(str(exc))
         if match:
             try:
                 return int(match.group(1))
             except ValueError:
                 return None
         return None
-
-    @staticmethod
-    def _as_utc_timestamp(value: datetime | pd.Timestamp) -> pd.Timestamp:
-        ts = pd.Timestamp(value)
-        if ts.tz is None:
-            return ts.tz_localize("UTC")
-        return ts.tz_convert("UTC")
@@ -1,20 +1,41 @@
 """Tomorrow.io weather provider."""
 from __future__ import annotations
 
+import logging
 import os
-import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
 import pandas as pd
 import requests
 
-from ..core import ForecastFrame, Provider, ensure_schema, resample_frame
-from ..normalize import normalize_tomorrow
+from ..core import ForecastFrame, Provider, as_utc_timestamp, ensure_schema, resample_frame, slice_window
+from ..http import dumps_json, provider_session, response_json
+from ..normalize import TOMORROW_FIELDS, empty_frame, normalize_tomorrow
+
+logger = logging.getLogger(__name__)
+
+_NOWCAST_LOOKBACK = pd.Timedelta(minutes=15)
+_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
+
+def _split_timelines(payload: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Normalize each timeline of a multi-timestep response separately, keyed by timestep."""
+    data = payload.get("data") if isinstance(payload, dict) else None
+    timelines = data.get("timelines") if isinstance(data, dict) else None
+    if not isinstance(timelines, list):
+        return {}
+    return {
+        timeline["timestep"]: normalize_tomorrow({"data": {"timelines": [timeline]}})
+        for timeline in timelines
+        if isinstance(timeline, dict) and timeline.get("timestep")
+    }
 
 
 class TomorrowIOProvider(Provider):
     API_ENDPOINT = "https://api.tomorrow.io/v4/timelines"
+    supports_nowcast = True
+    update_interval_s = 900
 
     def __init__(
         self,
@@ -22,7 +43,7 @@ class TomorrowIOProvider(Provider):
         latitude: float,
         longitude: float,
         api_key: Optional[str] = None,
-        ttl: int = 1800,
+        ttl: Optional[int] = None,
         priority: int = 140,
         cache=None,
         session: Optional[requests.Session] = None,
@@ -31,6 +52,8 @@ class TomorrowIOProvider(Provider):
         backoff: float = 1.0,
         skip_on_auth_failure: bool = True,
     ) -> None:
+        adaptive_ttl = ttl is None
+        ttl = self.update_interval_s if ttl is None else ttl
         super().__init__(
             "tomorrow_io",
             priority=priority,
@@ -38,40 +61,56 @@ class TomorrowIOProvider(Provider):
             ttl=ttl,
             ttl_scopes={"hourly": ttl, "nowcast": ttl},
             session=session,
+            adaptive_ttl=adaptive_ttl,
         )
         self.latitude = latitude
         self.longitude = longitude
         self.api_key = api_key or os.getenv("TOMORROW_IO_API_KEY") or os.getenv("TOMORROWIO_API_KEY")
-        self.session = session or requests.Session()
+        # retries/backoff only shape the default session; an injected session is used as-is,
+        # so it retries only if the caller mounted a retrying adapter (see weather.http.make_session).
+        self.session = session or provider_session(retries, backoff)
         self.base_url = base_url or self.API_ENDPOINT
         self.retries = retries
         self.backoff = backoff
         self.skip_on_auth_failure = skip_on_auth_failure
         self._auth_failure_logged = False
         self._permanently_disabled = False
+        # Returned on every call once the provider is disabled; built once instead of per tick.
+        self._skipped_result = ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
+        if not self.api_key:
+            logger.warning("TOMORROW_IO_API_KEY is not configured; provider %s will be skipped", self.name)
+        # Only the window and timestep vary between requests.
+        self._base_payload: Dict[str, Any] = {
+            "location": {"type": "Point", "coordinates": [longitude, latitude]},
+            "fields": list(TOMORROW_FIELDS.values()),
+            "timezone": "UTC",
+        }
+        self._params = {"apikey": self.api_key}
+        self._hourly_key = {"lat": latitude, "lon": longitude, "timestep": "1h"}
+        self._nowcast_key = {"lat": latitude, "lon": longitude, "timestep": "15m"}
 
     def get_hourly(self, start: datetime, end: datetime) -> ForecastFrame:
-        # Skip provider if permanently disabled due to auth failure
-        if self._permanently_disabled:
-            from ..normalize import empty_frame
-            return ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
+        # Skip provider without touching the cache if it is disabled or has no key
+        if self._permanently_disabled or not self.api_key:
+            return self._skipped_result
 
-        start_ts = self._as_utc(start)
-        end_ts = self._as_utc(end)
+        start_ts = as_utc_timestamp(start)
+        end_ts = as_utc_timestamp(end)
 
         def _fetch() -> pd.DataFrame:
-            payload = self._request(start_ts, end_ts, "1h")
-            frame = normalize_tomorrow(payload)
-            return frame.loc[(frame.index >= start_ts) & (frame.index <= end_ts)]
+            # The API already bounds the response to the window; trimming happens after the cache.
+            return normalize_tomorrow(self._request(start_ts, end_ts, ["1h"]))
 
+        ttl = self.ttl_for("hourly", fallback=1800)
         frame = self.fetch_with_cache(
             "hourly",
-            {"lat": self.latitude, "lon": self.longitude, "timestep": "1h"},
+            self._hourly_key,
             _fetch,
-            ttl=self.ttl_for("hourly", fallback=1800),
+            ttl=ttl,
+            stale_ttl=ttl,
         )
         frame = ensure_schema(frame)
-        frame = frame.loc[(frame.index >= start_ts) & (frame.index <= end_ts)]
+        frame = slice_window(frame, start_ts, end_ts)
         metadata = {
             "source": self.name,
             "latitude": self.latitude,
@@ -79,92 +118,91 @@ class TomorrowIOProvider(Provider):
         }
         return ForecastFrame(frame, metadata)
 
-    def supports_nowcast(self) -> bool:
-        return True
-
     def get_nowcast(self, next_hours: int = 2) -> ForecastFrame:
-        # Skip provider if permanently disabled due to auth failure
-        if self._permanently_disabled:
-            from ..normalize import empty_frame
-            return ForecastFrame(empty_frame(), {"source": self.name, "skipped": True})
+        # Skip provider without touching the cache if it is disabled or has no key
+        if self._permanently_disabled or not self.api_key:
+            return self._skipped_result
 
         now_utc = pd.Timestamp.now(tz="UTC")
         horizon = now_utc + pd.Timedelta(hours=next_hours)
+        window_start = now_utc - _NOWCAST_LOOKBACK
 
         def _fetch() -> pd.DataFrame:
-            payload = self._request(now_utc - pd.Timedelta(minutes=15), horizon, "15m")
-            frame = normalize_tomorrow(payload)
-            return frame.loc[(frame.index >= now_utc - pd.Timedelta(minutes=15)) & (frame.index <= horizon)]
+            return normalize_tomorrow(self._request(window_start, horizon, ["15m"]))
 
         frame = self.fetch_with_cache(
             "nowcast",
-            {"lat": self.latitude, "lon": self.longitude, "timestep": "15m"},
+            self._nowcast_key,
             _fetch,
             ttl=self.ttl_for("nowcast", fallback=900),
         )
         frame = ensure_schema(frame)
-        window = frame.loc[(frame.index >= now_utc - pd.Timedelta(minutes=15)) & (frame.index <= horizon)]
+        window = slice_window(frame, window_start, horizon)
         resampled = resample_frame(window, "15min", method="interpolate")
         return ForecastFrame(resampled, {"source": self.name})
 
-    def _request(self, start: pd.Timestamp, end: pd.Timestamp, timestep: str) -> Dict[str, Any]:
+    def prefetch(self, start: datetime, end: datetime, next_hours: int = 2) -> None:
+        """Fill the hourly and nowcast caches with a single two-timestep request."""
+        if self._permanently_disabled or not self.api_key or self.is_throttled():
+            return
+        if self.has_cached("hourly", self._hourly_key) and self.has_cached("nowcast", self._nowcast_key):
+            return
+
+        now_utc = pd.Timestamp.now(tz="UTC")
+        horizon = now_utc + pd.Timedelta(hours=next_hours)
+        window_start = now_utc - _NOWCAST_LOOKBACK
+        # The API takes one window for all timesteps, so ask for the span covering both.
+        payload = self._request(
+            min(as_utc_timestamp(start), window_start),
+            max(as_utc_timestamp(end), horizon),
+            ["1h", "15m"],
+        )
+        timelines = _split_timelines(payload)
+        if "1h" in timelines:
+            self.store("hourly", self._hourly_key, timelines["1h"], ttl=self.ttl_for("hourly", fallback=1800))
+        if "15m" in timelines:
+            nowcast = slice_window(timelines["15m"], window_start, horizon)
+            self.store("nowcast", self._nowcast_key, nowcast, ttl=self.ttl_for("nowcast", fallback=900))
+
+    def _request(self, start: pd.Timestamp, end: pd.Timestamp, timesteps: Sequence[str]) -> Dict[str, Any]:
         if not self.api_key:
             raise RuntimeError("TOMORROW_IO_API_KEY is not configured")
 
         payload = {
-            "location": {"type": "Point", "coordinates": [self.longitude, self.latitude]},
-            "fields": [
-                "temperature",
-                "windSpeed",
-                "windDirection",
-                "cloudCover",
-                "humidity",
-                "uvIndex",
-                "solarGHI",
-            ],
-            "timesteps": [timestep],
+            **self._base_payload,
+            "timesteps": list(timesteps),
             "startTime": start.isoformat(),
             "endTime": end.isoformat(),
-            "timezone": "UTC",
         }
-        params = {"apikey": self.api_key}
-        headers = {"Accept": "application/json"}
-
-        last_exc: Optional[Exception] = None
-        for attempt in range(1, self.retries + 1):
-            try:
-                response = self.session.post(self.base_url, params=params, json=payload, headers=headers, timeout=10)
-                response.raise_for_status()
-                json_data = response.json()
-                # Validate that response contains expected structure
-                if not isinstance(json_data, dict):
-                    raise ValueError("API response is not a valid JSON object")
-                return json_data
-            except requests.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else None
-                if status_code in (401, 403) and self.skip_on_auth_failure:
-                    if not self._auth_failure_logged:
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.error(
-                            "Tomorrow.io authentication failed with status %s; provider disabled. "
-                            "To use Tomorrow.io, obtain a valid API key from https://www.tomorrow.io/weather-api/",
-                            status_code,
-                        )
-                        self._auth_failure_logged = True
-                        self._permanently_disabled = True
-                    return {"data": {"timelines": []}}
-                last_exc = exc
-                time.sleep(self.backoff * attempt)
-            except Exception as exc:  # pragma: no cover - network failure
-                last_exc = exc
-                time.sleep(self.backoff * attempt)
-                continue
-        raise RuntimeError(f"Tomorrow.io request failed after {self.retries} attempts: {last_exc}")
-
-    @staticmethod
-    def _as_utc(value: datetime | pd.Timestamp) -> pd.Timestamp:
-        ts = pd.Timestamp(value)
-        if ts.tz is None:
-            return ts.tz_localize("UTC")
-        return ts.tz_convert("UTC")
+
+        # Transient failures are retried by the session adapter (see weather.http.make_retry).
+        try:
+            response = self.session.post(
+                self.base_url,
+                params=self._params,
+                data=dumps_json(payload),
+                headers=_HEADERS,
+                timeout=10,
+            )
+            response.raise_for_status()
+            json_data = response_json(response)
+        except requests.HTTPError as exc:
+            status_code = exc.response.status_code if exc.response is not None else None
+            if status_code in (401, 403) and self.skip_on_auth_failure:
+                if not self._auth_failure_logged:
+                    logger.error(
+                        "Tomorrow.io authentication failed with status %s; provider disabled. "
+                        "To use Tomorrow.io, obtain a valid API key from https://www.tomorrow.io/weather-api/",
+                        status_code,
+                    )
+                    self._auth_failure_logged = True
+                    self._permanently_disabled = True
+                return {"data": {"timelines": []}}
+            self.note_rate_limit(exc.response)
+            raise RuntimeError(f"Tomorrow.io request failed: {exc}") from exc
+        except Exception as exc:  # pragma: no cover - network failure
+            raise RuntimeError(f"Tomorrow.io request failed: {exc}") from exc
+        # Validate that response contains expected structure
+        if not isinstance(json_data, dict):
+            raise RuntimeError("Tomorrow.io response is not a valid JSON object")
+        return json_data
@@ -5,17 +5,28 @@ import argparse
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import numpy as np
 import pandas as pd
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 _INITIAL_ENV_KEYS = set(os.environ.keys())
 _ENV_FILES_LOADED: set[Path] = set()
 _ENV_VAR_PATTERN = re.compile(r"\$\{([A-Za-z0-9_]+)\}")
+# Parsed YAML per resolved path with the mtime it was read at; an edit replaces the entry.
+# Env substitution still runs per load.
+_CONFIG_CACHE: Dict[Path, Tuple[int, object]] = {}
 TIMEZONE_ALIASES: Dict[str, str] = {
     "europe/brezoaia": "Europe/Bucharest",  # Brezoaia, Dambovita uses Bucharest timezone
     "brezoaia": "Europe/Bucharest",
@@ -51,25 +62,48 @@ def _load_env_files(candidates: Iterable[Path]) -> None:
         _load_env_file(candidate)
 
 
+def _substitute_env(match: re.Match[str], source: Optional[Path] = None) -> str:
+    var_name = match.group(1)
+    if var_name not in os.environ:
+        location = f" in config '{source}'" if source else ""
+        raise RuntimeError(f"Environment variable '{var_name}' referenced{location} is not set")
+    return os.environ[var_name]
+
+
 def _expand_env_values(value: object, *, source: Optional[Path] = None) -> object:
-    if isinstance(value, dict):
-        return {key: _expand_env_values(val, source=source) for key, val in value.items()}
-    if isinstance(value, list):
-        return [_expand_env_values(item, source=source) for item in value]
-    if isinstance(value, str):
-        def replacer(match: re.Match[str]) -> str:
-            var_name = match.group(1)
-            if var_name not in os.environ:
-                location = f" in config '{source}'" if source else ""
-                raise RuntimeError(f"Environment variable '{var_name}' referenced{location} is not set")
-            return os.environ[var_name]
-
-        return _ENV_VAR_PATTERN.sub(replacer, value)
-    return value
+    """Copy ``value`` with ``${VAR}`` references in every string replaced from the environment."""
+    replacer = partial(_substitute_env, source=source)
+
+    def expand(item: object) -> object:
+        if isinstance(item, dict):
+            copy: object = {}
+        elif isinstance(item, list):
+            copy = []
+        else:
+            # Most leaves hold no reference; skip the regex for those.
+            if isinstance(item, str) and "${" in item:
+                return _ENV_VAR_PATTERN.sub(replacer, item)
+            return item
+        pending.append((item, copy))
+        return copy
+
+    pending: List[Tuple[object, object]] = []
+    root = expand(value)
+    while pending:
+        original, copy = pending.pop()
+        if isinstance(original, dict):
+            for key, item in original.items():
+                copy[key] = expand(item)
+        else:
+            copy.extend(expand(item) for item in original)
+    return root
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
+@lru_cache(maxsize=128)
 def _resolve_timezone(candidate: Optional[str]) -> str:
     if not candidate:
         return "UTC"
@@ -84,12 +118,19 @@ def _resolve_timezone(candidate: Optional[str]) -> str:
         logger.info("Timezone alias '%s' resolved to '%s'", candidate, zone_name)
     return zone_name
 
-from .core import Provider, REQUIRED_COLUMNS, align_frames, ensure_schema, resample_frame, to_local
+from .core import (
+    ForecastFrame,
+    Provider,
+    REQUIRED_COLUMNS,
+    REQUIRED_COLUMNS_INDEX,
+    align_frames,
+    as_utc_timestamp,
+    resample_frame,
+    slice_window,
+    to_local,
+)
 from .cache import WeatherCache
 from .normalize import empty_frame
-from .providers.openmeteo_ecmwf import OpenMeteoECMWFProvider
-from .providers.openweather import OpenWeatherProvider
-from .providers.tomorrow_io import TomorrowIOProvider
 
 
 def load_weather_config(path: Optional[Path | str] = None) -> Dict[str, object]:
@@ -108,8 +149,15 @@ def load_weather_config(path: Optional[Path | str] = None) -> Dict[str, object]:
     candidates.append(Path("config") / "weather.yml")
     for candidate in candidates:
         if candidate.exists():
-            with candidate.open("r", encoding="utf-8") as handle:
-                data = yaml.safe_load(handle) or {}
+            resolved = candidate.resolve()
+            mtime_ns = candidate.stat().st_mtime_ns
+            cached = _CONFIG_CACHE.get(resolved)
+            if cached is not None and cached[0] == mtime_ns:
+                data = cached[1]
+            else:
+                data = yaml.load(candidate.read_bytes(), Loader=_YamlLoader) or {}
+                _CONFIG_CACHE[resolved] = (mtime_ns, data)
+            # Expansion rebuilds every container, so callers never share the cached tree.
             return _expand_env_values(data, source=candidate)
     return {}
 
@@ -134,6 +182,8 @@ def build_providers(
         ttl = entry.get("ttl") or entry.get("ttl_seconds")
         ttl_seconds = int(ttl) if ttl is not None else None
         if provider_type == "openweather":
+            from .providers.openweather import OpenWeatherProvider
+
             api_key = entry.get("api_key") or os.getenv("OPENWEATHER_API_KEY")
             instantiated.append(
                 OpenWeatherProvider(
@@ -141,7 +191,7 @@ def build_providers(
                     longitude=float(entry.get("lon", lon)),
                     api_key=api_key,
                     units=entry.get("units", "metric"),
-                    ttl=ttl_seconds or 1800,
+                    ttl=ttl_seconds,
                     priority=priority,
                     cache=cache,
                     skip_on_auth_failure=entry.get("skip_on_auth_failure", True),
@@ -149,26 +199,30 @@ def build_providers(
                 )
             )
         elif provider_type == "openmeteo_ecmwf":
+            from .providers.openmeteo_ecmwf import OpenMeteoECMWFProvider
+
             models = entry.get("models")
             instantiated.append(
                 OpenMeteoECMWFProvider(
                     latitude=float(entry.get("lat", lat)),
                     longitude=float(entry.get("lon", lon)),
                     models=models,
-                    ttl=ttl_seconds or 3600,
+                    ttl=ttl_seconds,
                     priority=priority,
                     cache=cache,
                     timezone=config.get("timezone", "UTC"),
                 )
             )
         elif provider_type == "tomorrow_io":
+            from .providers.tomorrow_io import TomorrowIOProvider
+
             api_key = entry.get("api_key") or os.getenv("TOMORROW_IO_API_KEY") or os.getenv("TOMORROWIO_API_KEY")
             instantiated.append(
                 TomorrowIOProvider(
                     latitude=float(entry.get("lat", lat)),
                     longitude=float(entry.get("lon", lon)),
                     api_key=api_key,
-                    ttl=ttl_seconds or 900,
+                    ttl=ttl_seconds,
                     priority=priority,
                     cache=cache,
                     skip_on_auth_failure=entry.get("skip_on_auth_failure", True),
@@ -186,37 +240,62 @@ class WeatherRouter:
         self.sources = sorted(sources, key=lambda p: p.priority)
         self.tz = tz
 
-    def get_hourly(self, start: datetime, end: datetime) -> pd.DataFrame:
-        start_ts = _as_utc_timestamp(start)
-        end_ts = _as_utc_timestamp(end)
-        frames: List[Tuple[str, pd.DataFrame]] = []
-        for provider in self.sources:
+    @staticmethod
+    def _fan_out(
+        providers: Sequence[Provider],
+        call: Callable[[Provider], _T],
+    ) -> List[Tuple[Provider, Union[_T, Exception]]]:
+        """Run ``call`` for every provider concurrently; results keep priority order.
+
+        Provider calls are dominated by HTTP round-trips, so threads overlap them on the
+        shared connection pool. Failures are returned in place of the forecast.
+        """
+
+        def _guarded(provider: Provider) -> Union[_T, Exception]:
             try:
-                forecast = provider.get_hourly(start_ts.to_pydatetime(), end_ts.to_pydatetime())
+                return call(provider)
             except Exception as exc:  # pragma: no cover - network errors handled at runtime
-                logger.warning("Hourly fetch failed for provider %s: %s", provider.name, exc)
+                return exc
+
+        if len(providers) <= 1:
+            return [(provider, _guarded(provider)) for provider in providers]
+        with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            return list(zip(providers, executor.map(_guarded, providers)))
+
+    def prefetch(self, start: datetime, end: datetime, next_hours: int = 2) -> None:
+        """Let providers warm their caches for a cycle that calls both get_hourly and get_nowcast.
+
+        Failures are only logged; the subsequent calls fetch whatever is still missing.
+        """
+        results = self._fan_out(self.sources, lambda provider: provider.prefetch(start, end, next_hours))
+        for provider, outcome in results:
+            if isinstance(outcome, Exception):  # pragma: no cover - network errors handled at runtime
+                logger.info("Prefetch failed for provider %s: %s", provider.name, outcome)
+
+    def get_hourly(self, start: datetime, end: datetime) -> pd.DataFrame:
+        start_ts = as_utc_timestamp(start)
+        end_ts = as_utc_timestamp(end)
+        frames: List[Tuple[str, pd.DataFrame]] = []
+        start_dt = start_ts.to_pydatetime()
+        end_dt = end_ts.to_pydatetime()
+        results = self._fan_out(self.sources, lambda provider: provider.get_hourly(start_dt, end_dt))
+        for provider, forecast in results:
+            if isinstance(forecast, Exception):  # pragma: no cover - network errors handled at runtime
+                logger.warning("Hourly fetch failed for provider %s: %s", provider.name, forecast)
                 continue
-            df = forecast.ensure_schema().data
-            df = df.loc[(df.index >= start_ts) & (df.index <= end_ts)]
+            df = slice_window(forecast.ensure_schema().data, start_ts, end_ts)
             if df.empty:
                 continue
-            df = ensure_schema(df)
             frames.append((provider.name, df))
-        merged = _merge(frames)
-        if merged.empty:
-            return merged
-        merged = merged.loc[(merged.index >= start_ts) & (merged.index <= end_ts)]
-        return merged
+        # Every input is already bounded to the window, so their union is too.
+        return _merge(frames)
 
     def get_nowcast(self, next_hours: int = 2) -> pd.DataFrame:
         frames: List[Tuple[str, pd.DataFrame]] = []
-        for provider in self.sources:
-            if not provider.supports_nowcast():
-                continue
-            try:
-                forecast = provider.get_nowcast(next_hours)
-            except Exception as exc:  # pragma: no cover - network errors handled at runtime
-                logger.warning("Nowcast fetch failed for provider %s: %s", provider.name, exc)
+        sources = [provider for provider in self.sources if provider.supports_nowcast]
+        for provider, forecast in self._fan_out(sources, lambda provider: provider.get_nowcast(next_hours)):
+            if isinstance(forecast, Exception):  # pragma: no cover - network errors handled at runtime
+                logger.warning("Nowcast fetch failed for provider %s: %s", provider.name, forecast)
                 continue
             df = forecast.ensure_schema().data
             if df.empty:
@@ -227,8 +306,14 @@ class WeatherRouter:
             return merged
         numeric = merged[list(REQUIRED_COLUMNS)]
         resampled = resample_frame(numeric, "15min", method="interpolate")
-        sources = merged["source"].reindex(resampled.index, method="pad")
-        resampled["source"] = sources
+        # Carry each merged row's source forward: bisect for the last merged timestamp at or
+        # before every resampled one and gather its category code (-1 where there is none).
+        source = merged["source"].array
+        merged_ns = merged.index.as_unit("ns").asi8
+        resampled_ns = resampled.index.as_unit("ns").asi8
+        position = np.searchsorted(merged_ns, resampled_ns, side="right") - 1
+        codes = np.where(position >= 0, source.codes[np.maximum(position, 0)], -1)
+        resampled["source"] = pd.Categorical.from_codes(codes, dtype=source.dtype)
         return resampled
 
     def to_local(self, frame: pd.DataFrame) -> pd.DataFrame:
@@ -236,46 +321,58 @@ class WeatherRouter:
 
 
 def _merge(frames: Sequence[Tuple[str, pd.DataFrame]]) -> pd.DataFrame:
+    """Combine ``(provider name, frame)`` pairs cell by cell; earlier pairs win.
+
+    Callers pass frames in provider priority order, which ``WeatherRouter.sources`` and
+    ``_fan_out`` preserve; nothing here re-sorts them. ``source`` is categorical over the
+    provider names rather than object strings; ``==`` and ``isin`` still work, but use
+    ``.astype(str)`` where plain strings are required.
+    """
     if not frames:
         empty = empty_frame()
-        empty["source"] = pd.Series(dtype="object")
+        empty["source"] = pd.Categorical([])
         return empty
 
     indices = [frame for _, frame in frames]
     union = align_frames(indices)
-    result = pd.DataFrame(index=union, columns=list(REQUIRED_COLUMNS), dtype=float)
-    source = pd.Series(index=union, dtype="object")
-
-    for name, frame in frames:
-        aligned = frame.reindex(union)
-        row_mask = aligned.notna().any(axis=1)
-        for column in REQUIRED_COLUMNS:
-            current = result[column]
-            incoming = aligned[column]
-            fill_mask = current.isna() & incoming.notna()
-            if fill_mask.any():
-                result.loc[fill_mask, column] = incoming.loc[fill_mask]
-        source_fill = row_mask & source.isna()
-        if source_fill.any():
-            source.loc[source_fill] = name
-
-    result["source"] = source
+    columns = list(REQUIRED_COLUMNS)
+    name, frame = frames[0]
+    if (
+        len(frames) == 1
+        and not frame.empty
+        and frame.columns.equals(REQUIRED_COLUMNS_INDEX)
+        and bool((frame.dtypes == np.float64).all())
+        and frame.index.equals(union)
+    ):
+        # A single schema-conformant provider has nothing to merge against; only the source is added.
+        result = frame.copy()
+        codes = np.where(np.isnan(frame.to_numpy(dtype=np.float64)).all(axis=1), -1, 0)
+        result["source"] = pd.Categorical.from_codes(codes, categories=[name])
+        return result
+
+    # (providers, rows, columns) in priority order; each cell takes the first provider with a value.
+    stacked = np.stack([frame.reindex(union)[columns].to_numpy(dtype=np.float64) for frame in indices])
+    valid = ~np.isnan(stacked)
+    first = valid.argmax(axis=0)
+    merged = np.take_along_axis(stacked, first[np.newaxis], axis=0)[0]
+    result = pd.DataFrame(merged, index=union, columns=columns)
+
+    # A row is credited to the first provider that had any value for it; rows without data get NaN.
+    row_valid = valid.any(axis=2)
+    names = [name for name, _ in frames]
+    categories = list(dict.fromkeys(names))
+    provider_codes = np.array([categories.index(name) for name in names])
+    codes = np.where(row_valid.any(axis=0), provider_codes[row_valid.argmax(axis=0)], -1)
+    result["source"] = pd.Categorical.from_codes(codes, categories=categories)
     return result
 
 
-def _as_utc_timestamp(value: datetime | pd.Timestamp) -> pd.Timestamp:
-    ts = pd.Timestamp(value)
-    if ts.tz is None:
-        return ts.tz_localize("UTC")
-    return ts.tz_convert("UTC")
-
-
 def write_output(frame: pd.DataFrame, out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     suffix = out_path.suffix.lower()
     if suffix == ".parquet":
         try:
-            frame.to_parquet(out_path)
+            frame.to_parquet(out_path, engine="pyarrow", compression="snappy", index=True)
         except ImportError:  # pragma: no cover - handled at runtime if pyarrow missing
             csv_path = out_path.with_suffix(".csv")
             frame.to_csv(csv_path)